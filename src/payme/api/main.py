@@ -6,7 +6,7 @@ import logging
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from payme.api.dependencies import STRIPE_ACCOUNT_REQUIRED_ERROR_CODE
 from payme.api.v1.routes import (
@@ -26,7 +26,7 @@ from payme.core.settings import settings
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="payme", version="0.1.0")
+app = FastAPI(title="payme", version="0.1.0", default_response_class=ORJSONResponse)
 
 # CORS: read from param config (e.g. SSM), default to *
 cors_value = (settings.cors_allowed_origins or "*").strip()
@@ -64,11 +64,11 @@ def http_exception_handler(_, exc: HTTPException):
         and isinstance(exc.detail, dict)
         and exc.detail.get("error_code") == STRIPE_ACCOUNT_REQUIRED_ERROR_CODE
     ):
-        return JSONResponse(status_code=exc.status_code, content=exc.detail)
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+        return ORJSONResponse(status_code=exc.status_code, content=exc.detail)
+    return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
 
 
 @app.exception_handler(Exception)
 def unhandled_exception_handler(_, exc: Exception):
     logger.exception("Unhandled exception")
-    return JSONResponse(status_code=500, content={"detail": "Internal server error"})
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
@@ -0,0 +1,31 @@
+"""Custom request/route classes: decode JSON request bodies with orjson."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    async def json(self) -> Any:
+        # Same caching as Starlette's Request.json(). orjson.JSONDecodeError subclasses
+        # json.JSONDecodeError, so FastAPI still turns bad bodies into 422s.
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """APIRoute whose handlers parse JSON bodies with orjson instead of stdlib json."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request) -> Response:
+            return await original_route_handler(ORJSONRequest(request.scope, request.receive))
+
+        return custom_route_handler
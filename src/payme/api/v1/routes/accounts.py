@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated
 
 import stripe
@@ -60,33 +61,44 @@ def _transfer_pending_earnings(
     successful_transfers = 0
     failed_transfers = 0
     transferred_currencies: list[str] = []
+    to_transfer = [(currency, int(amount)) for currency, amount in pending.items() if int(amount) > 0]
 
-    for currency, amount in pending.items():
-        amount_minor = int(amount)
-        if amount_minor <= 0:
-            continue
+    def _transfer(currency: str, amount_minor: int) -> Exception | None:
         try:
             stripe_platform_service.create_transfer(
                 amount=amount_minor,
                 currency=currency,
                 destination=stripe_account_id,
             )
+        except Exception as exc:
+            return exc
+        return None
+
+    # Each transfer is a Stripe round-trip; run them concurrently when there is more than one currency.
+    if len(to_transfer) > 1:
+        with ThreadPoolExecutor(max_workers=len(to_transfer)) as pool:
+            outcomes = list(pool.map(lambda item: _transfer(*item), to_transfer))
+    else:
+        outcomes = [_transfer(currency, amount_minor) for currency, amount_minor in to_transfer]
+
+    for (currency, amount_minor), exc in zip(to_transfer, outcomes):
+        if exc is None:
             transferred_currencies.append(currency)
             successful_transfers += 1
-        except Exception as exc:
-            failed_transfers += 1
-            logger.warning(
-                "Failed transfer from account status endpoint user_id=%s stripe_account_id=%s currency=%s amount=%s: %s",
-                user_id,
-                stripe_account_id,
-                currency,
-                amount_minor,
-                exc,
-            )
+            continue
+        failed_transfers += 1
+        logger.warning(
+            "Failed transfer from account status endpoint user_id=%s stripe_account_id=%s currency=%s amount=%s: %s",
+            user_id,
+            stripe_account_id,
+            currency,
+            amount_minor,
+            exc,
+        )
 
     if transferred_currencies:
         stripe_accounts_repository.clear_pending_earnings(
-            user_id, only_currencies=transferred_currencies
+            user_id, only_currencies=tuple(transferred_currencies)
         )
 
     record_transfer_results(
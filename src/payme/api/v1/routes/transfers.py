@@ -6,6 +6,7 @@ import logging
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, model_validator
 
 from payme.api.dependencies import (
@@ -13,13 +14,15 @@ from payme.api.dependencies import (
     get_stripe_platform_account_service,
     require_principal,
 )
+from payme.api.routing import ORJSONRoute
 from payme.core.auth import Principal
 from payme.core.constants import StripeAccountStatus
 from payme.db.repositories import StripeAccountRepository
+from payme.models.transfer import PayoutScheduleResponse, PayoutsResponse
 from payme.services.cloudwatch_metrics import record_payout_results
 from payme.services.stripe_platform_account_service import StripePlatformAccountService
 
-router = APIRouter(prefix="/transfers", tags=["transfers"])
+router = APIRouter(prefix="/transfers", tags=["transfers"], route_class=ORJSONRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -69,7 +72,9 @@ class PayoutScheduleRequest(BaseModel):
         return self
 
 
-@router.post("/payouts")
+# Routes return ORJSONResponse directly; models are listed under responses= for OpenAPI only,
+# so FastAPI does not re-validate the body as it would with response_model=.
+@router.post("/payouts", responses={200: {"model": PayoutsResponse}})
 def create_payouts(
     principal: Annotated[Principal, Depends(require_principal(StripeAccountStatus.VERIFIED))],
     stripe_accounts_repository: Annotated[StripeAccountRepository, Depends(get_stripe_accounts_repository)],
@@ -77,7 +82,7 @@ def create_payouts(
         type[StripePlatformAccountService],
         Depends(get_stripe_platform_account_service),
     ],
-) -> dict:
+) -> ORJSONResponse:
     """
     Create payouts from the connected account's available Stripe balance to bank account.
     """
@@ -112,27 +117,31 @@ def create_payouts(
             principal.user_id,
             stripe_account_id,
         )
-        return {
-            "stripe_account_id": stripe_account_id,
-            "transferred": {},
-            "failed": {},
-            "payout_ids": {},
-            "status": "no_balance",
-            "message": "No available balance in connected Stripe account to payout",
-        }
+        return ORJSONResponse(
+            {
+                "stripe_account_id": stripe_account_id,
+                "transferred": {},
+                "failed": {},
+                "payout_ids": {},
+                "status": "no_balance",
+                "message": "No available balance in connected Stripe account to payout",
+            }
+        )
 
     stripe_accounts_repository.clear_pending_earnings(principal.user_id)
 
-    return {
-        "stripe_account_id": stripe_account_id,
-        "transferred": transferred,
-        "failed": failed,
-        "payout_ids": payout_ids,
-        "status": "success",
-    }
+    return ORJSONResponse(
+        {
+            "stripe_account_id": stripe_account_id,
+            "transferred": transferred,
+            "failed": failed,
+            "payout_ids": payout_ids,
+            "status": "success",
+        }
+    )
 
 
-@router.post("/schedules")
+@router.post("/schedules", responses={200: {"model": PayoutScheduleResponse}})
 def create_payout_schedule(
     payload: PayoutScheduleRequest,
     principal: Annotated[Principal, Depends(require_principal(StripeAccountStatus.VERIFIED))],
@@ -140,7 +149,7 @@ def create_payout_schedule(
         type[StripePlatformAccountService],
         Depends(get_stripe_platform_account_service),
     ],
-) -> dict:
+) -> ORJSONResponse:
     """
     Configure automatic payout schedule for user's connected Stripe account.
     """
@@ -157,7 +166,10 @@ def create_payout_schedule(
         weekly_anchor=payload.weekly_anchor,
         monthly_anchor=payload.monthly_anchor,
     )
-    return {
-        "stripe_account_id": stripe_account_id,
-        "schedule": schedule,
-    }
+    # Stripe may return a StripeObject here; copy it to a plain dict for orjson.
+    return ORJSONResponse(
+        {
+            "stripe_account_id": stripe_account_id,
+            "schedule": dict(schedule),
+        }
+    )
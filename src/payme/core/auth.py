@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any
@@ -27,7 +29,7 @@ STRIPE_ACCOUNT_REQUIRED_PAYLOAD = {
 }
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class Principal:
     """
     Authenticated principal: the logged-in user (from JWT) with Stripe Connect account.
@@ -50,8 +52,11 @@ class CognitoJwksCache:
     def __init__(self) -> None:
         self._jwks: dict[str, Any] | None = None
         self._expires_at = 0.0
+        # Bumped on every fetch, so caches derived from the key set can tell when it changed.
+        self.version = 0
 
     def get(self) -> dict[str, Any]:
+        """Return {"raw": <JWKS document>, "by_kid": {kid: key}}; indexed once per fetch."""
         now = time.time()
         if self._jwks and now < self._expires_at:
             return self._jwks
@@ -61,8 +66,13 @@ class CognitoJwksCache:
         )
         resp = requests.get(url, timeout=5)
         resp.raise_for_status()
-        self._jwks = resp.json()
+        raw = resp.json()
+        self._jwks = {
+            "raw": raw,
+            "by_kid": {key["kid"]: key for key in raw.get("keys", []) if key.get("kid")},
+        }
         self._expires_at = now + 3600
+        self.version += 1
         return self._jwks
 
 
@@ -71,15 +81,13 @@ _jwks_cache = CognitoJwksCache()
 
 def _get_signing_key(token: str) -> dict[str, Any]:
     headers = jwt.get_unverified_header(token)
-    kid = headers.get("kid")
-    jwks = _jwks_cache.get()
-    for key in jwks.get("keys", []):
-        if key.get("kid") == kid:
-            return key
-    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    key = _jwks_cache.get()["by_kid"].get(headers.get("kid"))
+    if key is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return key
 
 
-def _decode_token(token: str) -> dict[str, Any]:
+def _verify_token(token: str) -> dict[str, Any]:
     key = _get_signing_key(token)
     issuer = (
         f"https://cognito-idp.{settings.cognito_region}.amazonaws.com/"
@@ -97,6 +105,73 @@ def _decode_token(token: str) -> dict[str, Any]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
 
 
+class TokenClaimsCache:
+    """
+    Short-lived cache of verified JWT claims, keyed by a hash of the token.
+    Entries live for at most ttl seconds and never past the token's own exp; the whole
+    cache is dropped when the JWKS is refetched (e.g. after key rotation).
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 10_000) -> None:
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entries: dict[bytes, tuple[float, dict[str, Any]]] = {}
+        self._jwks_version = 0
+        # Sync dependencies run in FastAPI's threadpool, so concurrent requests share this cache.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def _sync_jwks_version(self) -> None:
+        """Drop every entry if the JWKS was refetched since the last call. Caller holds the lock."""
+        if _jwks_cache.version != self._jwks_version:
+            self._entries.clear()
+            self._jwks_version = _jwks_cache.version
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        key = self._key(token)
+        with self._lock:
+            self._sync_jwks_version()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            return claims
+
+    def put(self, token: str, claims: dict[str, Any]) -> None:
+        now = time.time()
+        expires_at = now + self._ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._sync_jwks_version()
+            if len(self._entries) >= self._maxsize:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self._maxsize:
+                    self._entries.clear()
+            self._entries[key] = (expires_at, claims)
+
+
+_claims_cache = TokenClaimsCache()
+
+
+def _decode_token(token: str) -> dict[str, Any]:
+    claims = _claims_cache.get(token)
+    if claims is None:
+        claims = _verify_token(token)
+        _claims_cache.put(token, claims)
+    return claims
+
+
 def resolve_principal(
     request: Request,
     identities_repo: UserIdentitiesRepository,
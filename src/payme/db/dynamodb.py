@@ -5,7 +5,8 @@ import os
 import boto3
 
 
-def get_dynamodb_resource():
+def get_dynamodb_resource(session: boto3.Session | None = None):
+    """DynamoDB resource; pass ``session`` to reuse its credentials and loaded service models."""
     endpoint_url = os.getenv("DYNAMODB_ENDPOINT_URL")
     region = os.getenv("AWS_REGION", "eu-west-2")
-    return boto3.resource("dynamodb", region_name=region, endpoint_url=endpoint_url)
+    return (session or boto3).resource("dynamodb", region_name=region, endpoint_url=endpoint_url)
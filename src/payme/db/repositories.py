@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import base64
 import json
+import logging
 import uuid
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
+import boto3
 from boto3.dynamodb.conditions import Attr, Key
 
 from payme.core.constants import StripeAccountStatus
@@ -14,6 +17,8 @@ from payme.core.settings import settings
 from payme.db.dynamodb import get_dynamodb_resource
 from payme.services.cloudwatch_metrics import increment_transactions
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class UserRecord:
@@ -23,8 +28,8 @@ class UserRecord:
 
 
 class UsersRepository:
-    def __init__(self) -> None:
-        self._table = get_dynamodb_resource().Table(settings.ddb_table_users)
+    def __init__(self, session: boto3.Session | None = None) -> None:
+        self._table = get_dynamodb_resource(session).Table(settings.ddb_table_users)
 
     def get(self, user_id: str) -> UserRecord | None:
         resp = self._table.get_item(Key={"user_id": user_id})
@@ -61,8 +66,8 @@ class UsersRepository:
 
 
 class UserIdentitiesRepository:
-    def __init__(self) -> None:
-        self._table = get_dynamodb_resource().Table(settings.ddb_table_user_identities)
+    def __init__(self, session: boto3.Session | None = None) -> None:
+        self._table = get_dynamodb_resource(session).Table(settings.ddb_table_user_identities)
 
     def get(self, provider: str, external_sub: str) -> dict | None:
         identity_id = f"{provider}#{external_sub}"
@@ -112,7 +117,7 @@ class UserIdentitiesRepository:
             if not last_evaluated_key:
                 break
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StripeAccountRecord:
     user_id: str
     stripe_account_id: str
@@ -128,8 +133,8 @@ class StripeAccountRepository:
     Status: NEW (on create) -> RESTRICTED (Stripe deferred account created) -> VERIFIED (onboarding complete).
     """
 
-    def __init__(self) -> None:
-        self._table = get_dynamodb_resource().Table(settings.ddb_table_stripe_accounts)
+    def __init__(self, session: boto3.Session | None = None) -> None:
+        self._table = get_dynamodb_resource(session).Table(settings.ddb_table_stripe_accounts)
 
     def get_primary_for_user(self, user_id: str) -> StripeAccountRecord | None:
         """Return the Stripe Connect account for this user, if any."""
@@ -251,7 +256,7 @@ class StripeAccountRepository:
             return {}
         return {k: int(v) for k, v in pe.items() if isinstance(v, (int, float, Decimal)) and int(v) > 0}
 
-    def clear_pending_earnings(self, user_id: str, only_currencies: list[str] | None = None) -> None:
+    def clear_pending_earnings(self, user_id: str, only_currencies: Sequence[str] | None = None) -> None:
         """Zero out pending earnings after transfer. If only_currencies is set, only those keys are removed."""
         if not only_currencies:
             self._table.update_item(
@@ -260,8 +265,10 @@ class StripeAccountRepository:
                 ExpressionAttributeValues={":empty": {}},
             )
             return
-        names = {f"#c{i}": c.lower() for i, c in enumerate(only_currencies)}
-        remove_expr = "REMOVE " + ", ".join(f"pending_earnings.#c{i}" for i in range(len(only_currencies)))
+        # Dedupe (order-preserving): REMOVE rejects the same document path twice.
+        currencies = tuple(dict.fromkeys(c.lower() for c in only_currencies))
+        names = {f"#c{i}": c for i, c in enumerate(currencies)}
+        remove_expr = "REMOVE " + ", ".join(f"pending_earnings.{name}" for name in names)
         self._table.update_item(
             Key={"user_id": user_id},
             UpdateExpression=remove_expr,
@@ -277,9 +284,46 @@ class StripeAccountRepository:
         self._table.delete_item(Key={"user_id": user_id})
 
 
+@dataclass(slots=True, frozen=True)
+class ExpireCandidate:
+    """Active link past its expiry. For subscription links, link_id is the subscription_id."""
+
+    link_id: str
+    user_id: str
+    stripe_payment_link_id: str
+    on_platform: bool
+
+
+def _expire_candidates(items: list[dict], id_attr: str) -> list[ExpireCandidate]:
+    """
+    Build candidates from expired rows. Rows without a user or Stripe link id (e.g. drafts whose
+    Stripe link was never created) cannot be disabled on Stripe, so they are logged and skipped.
+    """
+    candidates = []
+    for item in items:
+        user_id = item.get("user_id")
+        stripe_payment_link_id = item.get("stripe_payment_link_id")
+        if not user_id or not stripe_payment_link_id:
+            logger.warning(
+                "Skipping expired %s %s: missing user_id or stripe_payment_link_id",
+                id_attr,
+                item[id_attr],
+            )
+            continue
+        candidates.append(
+            ExpireCandidate(
+                link_id=item[id_attr],
+                user_id=user_id,
+                stripe_payment_link_id=stripe_payment_link_id,
+                on_platform=bool(item.get("on_platform")),
+            )
+        )
+    return candidates
+
+
 class PaymentLinksRepository:
-    def __init__(self) -> None:
-        self._table = get_dynamodb_resource().Table(settings.ddb_table_payment_links)
+    def __init__(self, session: boto3.Session | None = None) -> None:
+        self._table = get_dynamodb_resource(session).Table(settings.ddb_table_payment_links)
 
     def create_draft(
         self,
@@ -350,7 +394,50 @@ class PaymentLinksRepository:
         require_fields: list[str],
     ) -> str:
         """Create full record (for backward compatibility / tests)."""
+        self._table.put_item(
+            Item=self._full_item(
+                link_id=link_id,
+                user_id=user_id,
+                stripe_payment_link_id=stripe_payment_link_id,
+                url=url,
+                title=title,
+                description=description,
+                amount=amount,
+                service_fee=service_fee,
+                currency=currency,
+                expires_at=expires_at,
+                link_type=link_type,
+                require_fields=require_fields,
+                created_at=datetime.now(timezone.utc).isoformat(),
+            )
+        )
+        return link_id
+
+    def create_many(self, links: list[dict]) -> list[str]:
+        """Create several full records in one BatchWriteItem; each dict takes the arguments of ``create``."""
         now = datetime.now(timezone.utc).isoformat()
+        with self._table.batch_writer() as batch:
+            for link in links:
+                batch.put_item(Item=self._full_item(created_at=now, **link))
+        return [link["link_id"] for link in links]
+
+    @staticmethod
+    def _full_item(
+        *,
+        link_id: str,
+        user_id: str,
+        stripe_payment_link_id: str,
+        url: str,
+        title: str,
+        description: str | None,
+        amount: int,
+        service_fee: int,
+        currency: str,
+        expires_at: datetime | None,
+        link_type: str,
+        require_fields: list[str],
+        created_at: str,
+    ) -> dict:
         item = {
             "link_id": link_id,
             "user_id": user_id,
@@ -363,13 +450,12 @@ class PaymentLinksRepository:
             "currency": currency,
             "status": "ACTIVE",
             "link_type": link_type,
-            "created_at": now,
+            "created_at": created_at,
             "require_fields": require_fields,
         }
         if expires_at:
             item["expires_at"] = int(expires_at.timestamp())
-        self._table.put_item(Item=item)
-        return link_id
+        return item
 
     def get(self, link_id: str) -> dict | None:
         resp = self._table.get_item(Key={"link_id": link_id})
@@ -391,21 +477,29 @@ class PaymentLinksRepository:
             ExpressionAttributeValues={":s": "DISABLED"},
         )
 
-    def list_expired_candidates(self, now_ts: int, limit: int = 50) -> list[dict]:
+    def list_expired_candidates(self, now_ts: int, limit: int = 50) -> list[ExpireCandidate]:
         resp = self._table.query(
             IndexName="status_expires_at_index",
             KeyConditionExpression=Key("status").eq("ACTIVE")
             & Key("expires_at").lte(now_ts),
             Limit=limit,
         )
-        return resp.get("Items", [])
+        return _expire_candidates(resp.get("Items", []), "link_id")
 
-    def list_by_user(self, user_id: str, limit: int = 50) -> list[dict]:
-        resp = self._table.query(
-            IndexName="user_id_index",
-            KeyConditionExpression=Key("user_id").eq(user_id),
-            Limit=limit,
-        )
+    def list_by_user(
+        self, user_id: str, limit: int = 50, attributes: list[str] | None = None
+    ) -> list[dict]:
+        """List records for a user. ``attributes`` limits the returned fields (ProjectionExpression)."""
+        query_kwargs: dict = {
+            "IndexName": "user_id_index",
+            "KeyConditionExpression": Key("user_id").eq(user_id),
+            "Limit": limit,
+        }
+        if attributes:
+            names = {f"#p{i}": name for i, name in enumerate(attributes)}
+            query_kwargs["ProjectionExpression"] = ", ".join(names)
+            query_kwargs["ExpressionAttributeNames"] = names
+        resp = self._table.query(**query_kwargs)
         return resp.get("Items", [])
 
     def add_payment_result(self, link_id: str, earnings_amount: int, total_amount: int) -> None:
@@ -422,7 +516,7 @@ class PaymentLinksRepository:
         """Delete all payment links belonging to this user. Only for account deletion."""
         limit = 100
         while True:
-            items = self.list_by_user(user_id, limit=limit)
+            items = self.list_by_user(user_id, limit=limit, attributes=["link_id"])
             if not items:
                 break
             for item in items:
@@ -436,8 +530,8 @@ class TransactionsRepository:
     Stores transaction and user/payee details only; no earnings_amount.
     """
 
-    def __init__(self) -> None:
-        self._table = get_dynamodb_resource().Table(settings.ddb_table_transactions)
+    def __init__(self, session: boto3.Session | None = None) -> None:
+        self._table = get_dynamodb_resource(session).Table(settings.ddb_table_transactions)
 
     def put(
         self,
@@ -565,8 +659,8 @@ class TransactionsRepository:
 
 
 class SubscriptionsRepository:
-    def __init__(self) -> None:
-        self._table = get_dynamodb_resource().Table(settings.ddb_table_subscription_links)
+    def __init__(self, session: boto3.Session | None = None) -> None:
+        self._table = get_dynamodb_resource(session).Table(settings.ddb_table_subscription_links)
 
     def create_draft(
         self,
@@ -637,7 +731,50 @@ class SubscriptionsRepository:
         require_fields: list[str],
     ) -> str:
         """Create full record (for backward compatibility / tests)."""
+        self._table.put_item(
+            Item=self._full_item(
+                subscription_id=subscription_id,
+                user_id=user_id,
+                stripe_payment_link_id=stripe_payment_link_id,
+                url=url,
+                title=title,
+                description=description,
+                amount=amount,
+                service_fee=service_fee,
+                currency=currency,
+                interval=interval,
+                expires_at=expires_at,
+                require_fields=require_fields,
+                created_at=datetime.now(timezone.utc).isoformat(),
+            )
+        )
+        return subscription_id
+
+    def create_many(self, subscriptions: list[dict]) -> list[str]:
+        """Create several full records in one BatchWriteItem; each dict takes the arguments of ``create``."""
         now = datetime.now(timezone.utc).isoformat()
+        with self._table.batch_writer() as batch:
+            for subscription in subscriptions:
+                batch.put_item(Item=self._full_item(created_at=now, **subscription))
+        return [subscription["subscription_id"] for subscription in subscriptions]
+
+    @staticmethod
+    def _full_item(
+        *,
+        subscription_id: str,
+        user_id: str,
+        stripe_payment_link_id: str,
+        url: str,
+        title: str,
+        description: str | None,
+        amount: int,
+        service_fee: int,
+        currency: str,
+        interval: str,
+        expires_at: datetime | None,
+        require_fields: list[str],
+        created_at: str,
+    ) -> dict:
         item = {
             "subscription_id": subscription_id,
             "user_id": user_id,
@@ -650,26 +787,25 @@ class SubscriptionsRepository:
             "currency": currency,
             "interval": interval,
             "status": "ACTIVE",
-            "created_at": now,
+            "created_at": created_at,
             "require_fields": require_fields,
         }
         if expires_at:
             item["expires_at"] = int(expires_at.timestamp())
-        self._table.put_item(Item=item)
-        return subscription_id
+        return item
 
     def get(self, subscription_id: str) -> dict | None:
         resp = self._table.get_item(Key={"subscription_id": subscription_id})
         return resp.get("Item")
 
-    def list_expired_candidates(self, now_ts: int, limit: int = 50) -> list[dict]:
+    def list_expired_candidates(self, now_ts: int, limit: int = 50) -> list[ExpireCandidate]:
         resp = self._table.query(
             IndexName="status_expires_at_index",
             KeyConditionExpression=Key("status").eq("ACTIVE")
             & Key("expires_at").lte(now_ts),
             Limit=limit,
         )
-        return resp.get("Items", [])
+        return _expire_candidates(resp.get("Items", []), "subscription_id")
 
     def mark_expired(self, subscription_id: str) -> None:
         self._table.update_item(
@@ -687,12 +823,20 @@ class SubscriptionsRepository:
             ExpressionAttributeValues={":s": "DISABLED"},
         )
 
-    def list_by_user(self, user_id: str, limit: int = 50) -> list[dict]:
-        resp = self._table.query(
-            IndexName="user_id_index",
-            KeyConditionExpression=Key("user_id").eq(user_id),
-            Limit=limit,
-        )
+    def list_by_user(
+        self, user_id: str, limit: int = 50, attributes: list[str] | None = None
+    ) -> list[dict]:
+        """List records for a user. ``attributes`` limits the returned fields (ProjectionExpression)."""
+        query_kwargs: dict = {
+            "IndexName": "user_id_index",
+            "KeyConditionExpression": Key("user_id").eq(user_id),
+            "Limit": limit,
+        }
+        if attributes:
+            names = {f"#p{i}": name for i, name in enumerate(attributes)}
+            query_kwargs["ProjectionExpression"] = ", ".join(names)
+            query_kwargs["ExpressionAttributeNames"] = names
+        resp = self._table.query(**query_kwargs)
         return resp.get("Items", [])
 
     def get_by_stripe_payment_link_id(
@@ -724,7 +868,7 @@ class SubscriptionsRepository:
         """Delete all subscription links belonging to this user. Only for account deletion."""
         limit = 100
         while True:
-            items = self.list_by_user(user_id, limit=limit)
+            items = self.list_by_user(user_id, limit=limit, attributes=["subscription_id"])
             if not items:
                 break
             for item in items:
@@ -740,8 +884,8 @@ class StripeSubscriptionsRepository:
       - GSI: subscription_id_index (HASH=subscription_id)
     """
 
-    def __init__(self) -> None:
-        self._table = get_dynamodb_resource().Table(settings.ddb_table_subscriptions)
+    def __init__(self, session: boto3.Session | None = None) -> None:
+        self._table = get_dynamodb_resource(session).Table(settings.ddb_table_subscriptions)
 
     @staticmethod
     def _encode_cursor(key: dict | None) -> str | None:
@@ -2,14 +2,90 @@ from __future__ import annotations
 
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-from payme.db.repositories import PaymentLinksRepository, StripeAccountRepository, SubscriptionsRepository
+from payme.db.repositories import (
+    ExpireCandidate,
+    PaymentLinksRepository,
+    StripeAccountRepository,
+    SubscriptionsRepository,
+)
 from payme.services.payment_links import StripeConnectedAccountLinkService
 from payme.services.stripe_platform_account_service import StripePlatformAccountService
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Bound on concurrent Stripe disable calls per run.
+_STRIPE_CONCURRENCY = 8
+
+
+def _disable_on_stripe(candidate: ExpireCandidate, stripe_account_id: str | None, kind: str) -> bool:
+    """Disable one link on Stripe. Runs in a worker thread, so it must not touch DynamoDB."""
+    try:
+        if candidate.on_platform:
+            StripePlatformAccountService.disable_platform_payment_link(candidate.stripe_payment_link_id)
+        elif stripe_account_id:
+            StripeConnectedAccountLinkService.from_account_id(stripe_account_id).disable_payment_link(
+                candidate.stripe_payment_link_id
+            )
+        return True
+    except Exception as exc:  # pragma: no cover - infra error handling
+        logger.exception("Failed to expire %s %s: %s", kind, candidate.link_id, exc)
+        return False
+
+
+def _resolve_stripe_accounts(
+    candidates: list[ExpireCandidate], accounts_repo: StripeAccountRepository, kind: str
+) -> dict[str, str | None]:
+    """
+    Look up the connected account of every user with an off-platform candidate, once per user.
+    Users whose lookup fails are left out, so their candidates are skipped this run.
+    """
+    accounts: dict[str, str | None] = {}
+    for candidate in candidates:
+        if candidate.on_platform or candidate.user_id in accounts:
+            continue
+        try:
+            account = accounts_repo.get_primary_for_user(candidate.user_id)
+        except Exception as exc:  # pragma: no cover - infra error handling
+            logger.exception("Failed to expire %s %s: %s", kind, candidate.link_id, exc)
+            continue
+        accounts[candidate.user_id] = account.stripe_account_id if account else None
+    return accounts
+
+
+def _expire(
+    candidates: list[ExpireCandidate],
+    repo: PaymentLinksRepository | SubscriptionsRepository,
+    accounts_repo: StripeAccountRepository,
+    kind: str,
+) -> None:
+    """
+    Disable candidates on Stripe concurrently, then mark each disabled one EXPIRED.
+    DynamoDB is only used from this thread (boto3 resources are not thread-safe), and each status
+    is written on its own so one failed update does not leave the rest of the run ACTIVE.
+    """
+    if not candidates:
+        return
+    accounts = _resolve_stripe_accounts(candidates, accounts_repo, kind)
+    resolved = [c for c in candidates if c.on_platform or c.user_id in accounts]
+    if not resolved:
+        return
+    with ThreadPoolExecutor(max_workers=min(_STRIPE_CONCURRENCY, len(resolved))) as pool:
+        disabled = list(
+            pool.map(lambda c: _disable_on_stripe(c, accounts.get(c.user_id), kind), resolved)
+        )
+    # pool.map keeps input order, so links are marked in the order they were listed.
+    for candidate, ok in zip(resolved, disabled):
+        if not ok:
+            continue
+        try:
+            repo.mark_expired(candidate.link_id)
+            logger.info("Expired %s %s", kind, candidate.link_id)
+        except Exception as exc:
+            logger.exception("Failed to mark %s %s expired: %s", kind, candidate.link_id, exc)
+
 
 def handler(event, context):  # noqa: ANN001
     now_ts = int(time.time())
@@ -18,36 +94,10 @@ def handler(event, context):  # noqa: ANN001
     accounts_repo = StripeAccountRepository()
 
     expired_links = links_repo.list_expired_candidates(now_ts)
-    for link in expired_links:
-        try:
-            if link.get("on_platform"):
-                StripePlatformAccountService.disable_platform_payment_link(link["stripe_payment_link_id"])
-            else:
-                account = accounts_repo.get_primary_for_user(link["user_id"])
-                if account:
-                    StripeConnectedAccountLinkService.from_account_id(account.stripe_account_id).disable_payment_link(
-                        link["stripe_payment_link_id"]
-                    )
-            links_repo.mark_expired(link["link_id"])
-            logger.info("Expired payment link %s", link["link_id"])
-        except Exception as exc:  # pragma: no cover - infra error handling
-            logger.exception("Failed to expire payment link %s: %s", link.get("link_id"), exc)
+    _expire(expired_links, links_repo, accounts_repo, "payment link")
 
     expired_subs = subs_repo.list_expired_candidates(now_ts)
-    for sub in expired_subs:
-        try:
-            if sub.get("on_platform"):
-                StripePlatformAccountService.disable_platform_payment_link(sub["stripe_payment_link_id"])
-            else:
-                account = accounts_repo.get_primary_for_user(sub["user_id"])
-                if account:
-                    StripeConnectedAccountLinkService.from_account_id(account.stripe_account_id).disable_payment_link(
-                        sub["stripe_payment_link_id"]
-                    )
-            subs_repo.mark_expired(sub["subscription_id"])
-            logger.info("Expired subscription link %s", sub["subscription_id"])
-        except Exception as exc:  # pragma: no cover - infra error handling
-            logger.exception("Failed to expire subscription link %s: %s", sub.get("subscription_id"), exc)
+    _expire(expired_subs, subs_repo, accounts_repo, "subscription link")
 
     return {
         "expired_links": len(expired_links),
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class PayoutsResponse(BaseModel):
+    """Result of POST /transfers/payouts. status: success | no_balance."""
+
+    stripe_account_id: str
+    transferred: dict[str, int]
+    failed: dict[str, str]
+    payout_ids: dict[str, str]
+    status: str
+    message: str | None = None
+
+
+class PayoutScheduleResponse(BaseModel):
+    stripe_account_id: str
+    schedule: dict[str, Any]
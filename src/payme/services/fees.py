@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left
+
 from payme.core.settings import settings
 
 
@@ -10,11 +12,28 @@ from payme.core.settings import settings
 # -------------------------------------------------------------------------
 
 
-def _multiplier(service_fee_percent: float, stripe_fee_percent: float) -> float:
-    combined_pct = service_fee_percent + stripe_fee_percent
-    if combined_pct >= 100:
+# 100% expressed in basis points; percentages are converted to integer bps before any arithmetic.
+_BPS_PER_UNIT = 10_000
+
+
+def _to_bps(percent: float) -> int:
+    return round(percent * 100)
+
+
+def _combined_bps(service_fee_percent: float, stripe_fee_percent: float) -> int:
+    """Combined fee in basis points; rejects totals of 100% or more with a single int compare."""
+    combined = _to_bps(service_fee_percent) + _to_bps(stripe_fee_percent)
+    if combined >= _BPS_PER_UNIT:
         raise ValueError("combined percentage must be < 100")
-    return 1 / (1 - combined_pct / 100)
+    return combined
+
+
+def _multiplier(service_fee_percent: float, stripe_fee_percent: float) -> float:
+    return _BPS_PER_UNIT / (_BPS_PER_UNIT - _combined_bps(service_fee_percent, stripe_fee_percent))
+
+
+def _div_round_half_up(numerator: int, denominator: int) -> int:
+    return (2 * numerator + denominator) // (2 * denominator)
 
 
 _TIER_THRESHOLDS_CENTS = (1000, 2000, 5000, 10000, 50000, 100000, 500000, 1000000)
@@ -26,12 +45,8 @@ def _tier_fixed_fee(amount_cents: int) -> int:
     Fixed fee schedule based on amount tiers (10, 20, 50, ... 10,000).
     Currency is intentionally ignored; tiers are applied directly in minor units.
     """
-    tier_index = len(_TIER_THRESHOLDS_CENTS)  # final tier (> 10,000)
-    for idx, threshold in enumerate(_TIER_THRESHOLDS_CENTS):
-        if amount_cents <= threshold:
-            tier_index = idx
-            break
-
+    # First threshold >= amount; past the last threshold this is the final (> 10,000) tier.
+    tier_index = bisect_left(_TIER_THRESHOLDS_CENTS, amount_cents)
     return _TIER_FEES_CENTS[tier_index]
 
 
@@ -79,8 +94,9 @@ def amount_with_fee(
     svc_pct = 0.0
     stripe_pct = settings.stripe_fee_percent if stripe_fee_percent is None else stripe_fee_percent
 
-    multiplier = _multiplier(svc_pct, stripe_pct)
-    total_cents = int(round((amount_cents + fixed) * multiplier))
+    combined_bps = _combined_bps(svc_pct, stripe_pct)
+    # total = (amount + fixed) / (1 - pct), in integer bps with half-up rounding.
+    total_cents = _div_round_half_up((amount_cents + fixed) * _BPS_PER_UNIT, _BPS_PER_UNIT - combined_bps)
 
     # Platform fee is fixed per amount tier.
     service_fee_cents = fixed
@@ -169,7 +185,7 @@ def earnings_from_payment(
     svc_pct = settings.service_fee_percent if service_fee_percent is None else service_fee_percent
     stripe_pct = settings.stripe_fee_percent if stripe_fee_percent is None else stripe_fee_percent
 
-    _multiplier(svc_pct, stripe_pct)  # validates combined_pct < 100
+    _combined_bps(svc_pct, stripe_pct)  # validates combined percentage < 100
 
     service_fee_cents = (
         int(known_service_fee_cents)
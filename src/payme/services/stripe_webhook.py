@@ -121,7 +121,7 @@ def handle_account_updated(data: dict[str, Any]) -> bool:
             )
             if transferred_currencies:
                 accounts_repo.clear_pending_earnings(
-                    record.user_id, only_currencies=transferred_currencies
+                    record.user_id, only_currencies=tuple(transferred_currencies)
                 )
     except Exception as e:
         logger.exception("Webhook account.updated: failed to update status: %s", e)
@@ -1,4 +1,11 @@
 import os
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from fastapi.testclient import TestClient
 
 # Tests must be deterministic and must not depend on a developer's local `.env`.
 # Provide a minimal, stable environment for Settings() to boot.
@@ -28,3 +35,23 @@ os.environ.setdefault("DDB_TABLE_SUBSCRIPTIONS", "payme-subscriptions")
 os.environ.setdefault("DDB_TABLE_TRANSACTIONS", "payme-transactions")
 
 os.environ.setdefault("CORS_ALLOWED_ORIGINS", "*")
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator["TestClient"]:
+    """
+    One TestClient for the whole session. Entering it as a context manager runs the app's lifespan
+    (``app.router.lifespan_context``) once at session start and once at teardown, rather than lazily
+    per client. Dependency overrides live on ``app``, so tests take this fixture instead of building
+    their own TestClient.
+
+    The app is imported here rather than at module level so the environment defaults above are in
+    place before settings load.
+    """
+    from fastapi.testclient import TestClient
+
+    from payme.api.main import app
+
+    with TestClient(app) as c:
+        yield c
+
@@ -1,10 +1,4 @@
-from fastapi.testclient import TestClient
-
-from payme.api.main import app
-
-
-def test_health():
-    client = TestClient(app)
+def test_health(client):
     response = client.get("/api/v1/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
@@ -0,0 +1,131 @@
+"""Shared moto DynamoDB fixtures for the repository integration tests."""
+
+from __future__ import annotations
+
+import copy
+
+import boto3
+import pytest
+from boto3.dynamodb.types import TypeSerializer
+from moto import mock_aws
+from moto.core import DEFAULT_ACCOUNT_ID
+from moto.dynamodb.models import dynamodb_backends
+
+_REGION = "eu-west-2"
+
+
+_NUMBER_ATTRIBUTES = frozenset({"expires_at"})
+
+_USER_ID_INDEX = {
+    "IndexName": "user_id_index",
+    "KeySchema": [{"AttributeName": "user_id", "KeyType": "HASH"}],
+    "Projection": {"ProjectionType": "ALL"},
+}
+_STATUS_EXPIRES_AT_INDEX = {
+    "IndexName": "status_expires_at_index",
+    "KeySchema": [
+        {"AttributeName": "status", "KeyType": "HASH"},
+        {"AttributeName": "expires_at", "KeyType": "RANGE"},
+    ],
+    "Projection": {"ProjectionType": "ALL"},
+}
+
+
+def _table_spec(table_name: str, key_schema: list[dict], *gsis: dict) -> dict:
+    """``create_table`` kwargs, with AttributeDefinitions derived from the keys actually used."""
+    # DynamoDB rejects attribute definitions that no key uses.
+    attributes = [key["AttributeName"] for key in key_schema]
+    for gsi in gsis:
+        attributes += [key["AttributeName"] for key in gsi["KeySchema"] if key["AttributeName"] not in attributes]
+    spec = {
+        "TableName": table_name,
+        "KeySchema": key_schema,
+        "AttributeDefinitions": [
+            {"AttributeName": name, "AttributeType": "N" if name in _NUMBER_ATTRIBUTES else "S"}
+            for name in attributes
+        ],
+        "BillingMode": "PAY_PER_REQUEST",
+    }
+    if gsis:
+        spec["GlobalSecondaryIndexes"] = list(gsis)
+    return spec
+
+
+# Every table the repository tests use, with only the GSIs they query. Built once at import.
+_TABLE_SPECS = (
+    _table_spec("payme-users", [{"AttributeName": "user_id", "KeyType": "HASH"}]),
+    _table_spec("payme-user-identities", [{"AttributeName": "identity_id", "KeyType": "HASH"}], _USER_ID_INDEX),
+    _table_spec(
+        "payme-stripe-accounts",
+        [{"AttributeName": "user_id", "KeyType": "HASH"}],
+        {
+            "IndexName": "stripe_account_id_index",
+            "KeySchema": [{"AttributeName": "stripe_account_id", "KeyType": "HASH"}],
+            "Projection": {"ProjectionType": "ALL"},
+        },
+    ),
+    _table_spec(
+        "payme-payment-links",
+        [{"AttributeName": "link_id", "KeyType": "HASH"}],
+        _USER_ID_INDEX,
+        _STATUS_EXPIRES_AT_INDEX,
+    ),
+    _table_spec("payme-subscription-links", [{"AttributeName": "subscription_id", "KeyType": "HASH"}], _USER_ID_INDEX),
+)
+
+
+def _create_tables():
+    dynamodb = boto3.resource("dynamodb", region_name=_REGION)
+    for spec in _TABLE_SPECS:
+        dynamodb.create_table(**spec)
+
+
+def _dynamodb_backend():
+    # The snapshot and seed fixtures use moto internals (the backend's ``tables`` dict and its
+    # ``Table.put_item``), which is why pyproject.toml caps moto below 6.
+    return dynamodb_backends[DEFAULT_ACCOUNT_ID][_REGION]
+
+
+@pytest.fixture(scope="session")
+def boto_session():
+    """One boto3 session shared by every repository built in these tests."""
+    return boto3.Session(region_name=_REGION)
+
+
+@pytest.fixture(scope="module")
+def aws_mock():
+    """
+    Start moto once per test module; per-test isolation comes from restoring the table snapshot.
+    Module scope stops moto's botocore patching and fake credentials before any test outside the
+    module runs in the same worker.
+    """
+    mock = mock_aws()
+    mock.start()
+    yield
+    mock.stop()
+
+
+@pytest.fixture(scope="module")
+def dynamodb_snapshot(aws_mock):
+    """Moto's table state right after schema creation, built once per module."""
+    _create_tables()
+    return copy.deepcopy(_dynamodb_backend().tables)
+
+
+@pytest.fixture
+def dynamodb_tables(dynamodb_snapshot):
+    """Restore the tables from the module's snapshot, dropping whatever the previous test wrote."""
+    _dynamodb_backend().tables = copy.deepcopy(dynamodb_snapshot)
+
+
+@pytest.fixture
+def seed(dynamodb_tables):
+    """Write arrange-phase items straight into moto's tables, skipping the boto3 request round-trip."""
+    serializer = TypeSerializer()
+
+    def _seed(table_name: str, items: list[dict]) -> None:
+        table = _dynamodb_backend().get_table(table_name)
+        for item in items:
+            table.put_item({name: serializer.serialize(value) for name, value in item.items()})
+
+    return _seed
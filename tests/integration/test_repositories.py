@@ -1,7 +1,6 @@
 from datetime import datetime, timezone
 
-import boto3
-from moto import mock_aws
+import pytest
 
 from payme.db.repositories import (
     PaymentLinksRepository,
@@ -12,133 +11,16 @@ from payme.db.repositories import (
 )
 
 
-def _create_tables():
-    dynamodb = boto3.resource("dynamodb", region_name="eu-west-2")
+pytestmark = pytest.mark.usefixtures("dynamodb_tables")
 
-    dynamodb.create_table(
-        TableName="payme-users",
-        KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}],
-        AttributeDefinitions=[{"AttributeName": "user_id", "AttributeType": "S"}],
-        BillingMode="PAY_PER_REQUEST",
-    )
-
-    dynamodb.create_table(
-        TableName="payme-user-identities",
-        KeySchema=[{"AttributeName": "identity_id", "KeyType": "HASH"}],
-        AttributeDefinitions=[
-            {"AttributeName": "identity_id", "AttributeType": "S"},
-            {"AttributeName": "user_id", "AttributeType": "S"},
-        ],
-        GlobalSecondaryIndexes=[
-            {
-                "IndexName": "user_id_index",
-                "KeySchema": [{"AttributeName": "user_id", "KeyType": "HASH"}],
-                "Projection": {"ProjectionType": "ALL"},
-            }
-        ],
-        BillingMode="PAY_PER_REQUEST",
-    )
-
-    dynamodb.create_table(
-        TableName="payme-stripe-accounts",
-        KeySchema=[{"AttributeName": "user_id", "KeyType": "HASH"}],
-        AttributeDefinitions=[
-            {"AttributeName": "user_id", "AttributeType": "S"},
-            {"AttributeName": "stripe_account_id", "AttributeType": "S"},
-        ],
-        GlobalSecondaryIndexes=[
-            {
-                "IndexName": "stripe_account_id_index",
-                "KeySchema": [{"AttributeName": "stripe_account_id", "KeyType": "HASH"}],
-                "Projection": {"ProjectionType": "ALL"},
-            }
-        ],
-        BillingMode="PAY_PER_REQUEST",
-    )
+_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_NOW_TS = int(_NOW.timestamp())
+_EXPECTED_PROVIDERS = frozenset({"cognito", "google"})
 
-    dynamodb.create_table(
-        TableName="payme-payment-links",
-        KeySchema=[{"AttributeName": "link_id", "KeyType": "HASH"}],
-        AttributeDefinitions=[
-            {"AttributeName": "link_id", "AttributeType": "S"},
-            {"AttributeName": "user_id", "AttributeType": "S"},
-            {"AttributeName": "status", "AttributeType": "S"},
-            {"AttributeName": "expires_at", "AttributeType": "N"},
-        ],
-        GlobalSecondaryIndexes=[
-            {
-                "IndexName": "user_id_index",
-                "KeySchema": [{"AttributeName": "user_id", "KeyType": "HASH"}],
-                "Projection": {"ProjectionType": "ALL"},
-            },
-            {
-                "IndexName": "status_expires_at_index",
-                "KeySchema": [
-                    {"AttributeName": "status", "KeyType": "HASH"},
-                    {"AttributeName": "expires_at", "KeyType": "RANGE"},
-                ],
-                "Projection": {"ProjectionType": "ALL"},
-            }
-        ],
-        BillingMode="PAY_PER_REQUEST",
-    )
 
-    dynamodb.create_table(
-        TableName="payme-subscription-links",
-        KeySchema=[{"AttributeName": "subscription_id", "KeyType": "HASH"}],
-        AttributeDefinitions=[
-            {"AttributeName": "subscription_id", "AttributeType": "S"},
-            {"AttributeName": "user_id", "AttributeType": "S"},
-            {"AttributeName": "status", "AttributeType": "S"},
-            {"AttributeName": "expires_at", "AttributeType": "N"},
-        ],
-        GlobalSecondaryIndexes=[
-            {
-                "IndexName": "user_id_index",
-                "KeySchema": [{"AttributeName": "user_id", "KeyType": "HASH"}],
-                "Projection": {"ProjectionType": "ALL"},
-            },
-            {
-                "IndexName": "status_expires_at_index",
-                "KeySchema": [
-                    {"AttributeName": "status", "KeyType": "HASH"},
-                    {"AttributeName": "expires_at", "KeyType": "RANGE"},
-                ],
-                "Projection": {"ProjectionType": "ALL"},
-            }
-        ],
-        BillingMode="PAY_PER_REQUEST",
-    )
-
-    dynamodb.create_table(
-        TableName="payme-subscriptions",
-        KeySchema=[
-            {"AttributeName": "user_id", "KeyType": "HASH"},
-            {"AttributeName": "created_at_key", "KeyType": "RANGE"},
-        ],
-        AttributeDefinitions=[
-            {"AttributeName": "user_id", "AttributeType": "S"},
-            {"AttributeName": "created_at_key", "AttributeType": "S"},
-            {"AttributeName": "subscription_id", "AttributeType": "S"},
-        ],
-        GlobalSecondaryIndexes=[
-            {
-                "IndexName": "subscription_id_index",
-                "KeySchema": [
-                    {"AttributeName": "subscription_id", "KeyType": "HASH"},
-                ],
-                "Projection": {"ProjectionType": "ALL"},
-            }
-        ],
-        BillingMode="PAY_PER_REQUEST",
-    )
-
-
-@mock_aws
-def test_user_identity_mapping_roundtrip():
-    _create_tables()
-    users_repo = UsersRepository()
-    identities_repo = UserIdentitiesRepository()
+def test_user_identity_mapping_roundtrip(boto_session):
+    users_repo = UsersRepository(session=boto_session)
+    identities_repo = UserIdentitiesRepository(session=boto_session)
 
     user = users_repo.create(email="test@example.com")
     identities_repo.create(user.user_id, "cognito", "sub-123", "test@example.com")
@@ -147,11 +29,9 @@ def test_user_identity_mapping_roundtrip():
     assert identity["user_id"] == user.user_id
 
 
-@mock_aws
-def test_user_accounts_create_and_get():
-    _create_tables()
-    users_repo = UsersRepository()
-    accounts_repo = StripeAccountRepository()
+def test_user_accounts_create_and_get(boto_session):
+    users_repo = UsersRepository(session=boto_session)
+    accounts_repo = StripeAccountRepository(session=boto_session)
 
     user = users_repo.create(email="test@example.com")
     accounts_repo.create(user.user_id, "acct_123", "GB")
@@ -172,33 +52,39 @@ def test_user_accounts_create_and_get():
     assert account.status == "VERIFIED"
 
 
-@mock_aws
-def test_user_accounts_one_per_user():
+def test_user_accounts_one_per_user(boto_session):
     """Enforce 1-1: a user can have only one Stripe account; second create for same user_id fails."""
     import botocore.exceptions
 
-    _create_tables()
-    users_repo = UsersRepository()
-    accounts_repo = StripeAccountRepository()
+    users_repo = UsersRepository(session=boto_session)
+    accounts_repo = StripeAccountRepository(session=boto_session)
 
     user = users_repo.create(email="test@example.com")
     accounts_repo.create(user.user_id, "acct_first", "GB")
 
-    try:
+    with pytest.raises(botocore.exceptions.ClientError) as exc:
         accounts_repo.create(user.user_id, "acct_second", "GB")
-        assert False, "Expected ConditionalCheckFailedException"
-    except botocore.exceptions.ClientError as e:
-        assert e.response["Error"]["Code"] == "ConditionalCheckFailedException"
+    assert exc.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
 
     account = accounts_repo.get_primary_for_user(user.user_id)
     assert account.stripe_account_id == "acct_first"
 
 
-@mock_aws
-def test_user_identity_get_by_user_id():
-    _create_tables()
-    users_repo = UsersRepository()
-    identities_repo = UserIdentitiesRepository()
+def test_clear_pending_earnings_only_currencies_dedupes(boto_session, seed):
+    accounts_repo = StripeAccountRepository(session=boto_session)
+    seed(
+        "payme-stripe-accounts",
+        [{"user_id": "user-1", "pending_earnings": {"gbp": 100, "usd": 50}}],
+    )
+
+    accounts_repo.clear_pending_earnings("user-1", only_currencies=("GBP", "gbp"))
+
+    assert accounts_repo.get_pending_earnings("user-1") == {"usd": 50}
+
+
+def test_user_identity_get_by_user_id(boto_session):
+    users_repo = UsersRepository(session=boto_session)
+    identities_repo = UserIdentitiesRepository(session=boto_session)
 
     user = users_repo.create(email="test@example.com")
     identities_repo.create(user.user_id, "cognito", "sub-123", "test@example.com")
@@ -207,14 +93,11 @@ def test_user_identity_get_by_user_id():
     results = identities_repo.get_by_user_id(user.user_id)
 
     assert len(results) == 2
-    providers = {item["provider"] for item in results}
-    assert providers == {"cognito", "google"}
+    assert frozenset(item["provider"] for item in results) == _EXPECTED_PROVIDERS
 
 
-@mock_aws
-def test_payment_link_create_draft_and_update_with_stripe():
-    _create_tables()
-    links_repo = PaymentLinksRepository()
+def test_payment_link_create_draft_and_update_with_stripe(boto_session):
+    links_repo = PaymentLinksRepository(session=boto_session)
 
     link_id = "link-draft-1"
     user_id = "user-1"
@@ -242,10 +125,8 @@ def test_payment_link_create_draft_and_update_with_stripe():
     assert item2["service_fee"] == 55
 
 
-@mock_aws
-def test_payment_link_expiry_query():
-    _create_tables()
-    links_repo = PaymentLinksRepository()
+def test_payment_link_expiry_query(boto_session):
+    links_repo = PaymentLinksRepository(session=boto_session)
 
     link_id = "link-1"
     links_repo.create(
@@ -258,66 +139,81 @@ def test_payment_link_expiry_query():
         amount=100,
         service_fee=5,
         currency="usd",
-        expires_at=datetime.now(timezone.utc),
+        expires_at=_NOW,
         link_type="one_time",
         require_fields=["email", "name"],
     )
 
-    results = links_repo.list_expired_candidates(int(datetime.now(timezone.utc).timestamp()) + 1)
+    results = links_repo.list_expired_candidates(_NOW_TS + 1)
     assert len(results) == 1
-    assert results[0]["link_id"] == link_id
+    assert results[0].link_id == link_id
+    assert results[0].stripe_payment_link_id == "plink_1"
+    assert results[0].on_platform is False
 
 
-@mock_aws
-def test_payment_links_list_by_user_and_status_updates():
-    _create_tables()
-    links_repo = PaymentLinksRepository()
+def test_payment_link_expiry_query_skips_drafts_without_stripe_link(boto_session):
+    links_repo = PaymentLinksRepository(session=boto_session)
 
-    links_repo.create(
-        link_id="link-1",
+    links_repo.create_draft(
+        link_id="link-draft-1",
         user_id="user-1",
-        stripe_payment_link_id="plink_1",
-        url="https://example.com",
-        title="Test",
+        title="Draft",
         description=None,
         amount=100,
-        service_fee=5,
-        currency="usd",
-        expires_at=None,
+        currency="gbp",
+        expires_at=_NOW,
         link_type="one_time",
         require_fields=["email", "name"],
     )
-    links_repo.create(
-        link_id="link-2",
-        user_id="user-1",
-        stripe_payment_link_id="plink_2",
-        url="https://example.com",
-        title="Test 2",
-        description=None,
-        amount=200,
-        service_fee=10,
-        currency="usd",
-        expires_at=None,
-        link_type="one_time",
-        require_fields=["email", "name"],
+
+    assert links_repo.list_expired_candidates(_NOW_TS + 1) == []
+
+
+def test_payment_links_create_many(boto_session):
+    links_repo = PaymentLinksRepository(session=boto_session)
+
+    link_ids = links_repo.create_many(
+        [
+            {
+                "link_id": f"link-{n}",
+                "user_id": "user-1",
+                "stripe_payment_link_id": f"plink_{n}",
+                "url": "https://example.com",
+                "title": "Test",
+                "description": None,
+                "amount": 100 * n,
+                "service_fee": 5 * n,
+                "currency": "usd",
+                "expires_at": None,
+                "link_type": "one_time",
+                "require_fields": ["email", "name"],
+            }
+            for n in (1, 2)
+        ]
     )
-    links_repo.create(
-        link_id="link-3",
-        user_id="user-2",
-        stripe_payment_link_id="plink_3",
-        url="https://example.com",
-        title="Other",
-        description=None,
-        amount=300,
-        service_fee=15,
-        currency="usd",
-        expires_at=None,
-        link_type="one_time",
-        require_fields=["email", "name"],
+
+    assert link_ids == ["link-1", "link-2"]
+    item = links_repo.get("link-2")
+    assert item["amount"] == 200
+    assert item["status"] == "ACTIVE"
+
+
+def test_payment_links_list_by_user_and_status_updates(boto_session, seed):
+    links_repo = PaymentLinksRepository(session=boto_session)
+    seed(
+        "payme-payment-links",
+        [
+            {"link_id": "link-1", "user_id": "user-1", "status": "ACTIVE", "amount": 100, "title": "Test"},
+            {"link_id": "link-2", "user_id": "user-1", "status": "ACTIVE", "amount": 200, "title": "Test"},
+            {"link_id": "link-3", "user_id": "user-2", "status": "ACTIVE", "amount": 300, "title": "Test"},
+        ],
     )
 
-    user_links = links_repo.list_by_user("user-1")
-    assert {item["link_id"] for item in user_links} == {"link-1", "link-2"}
+    user_links = links_repo.list_by_user("user-1", attributes=["link_id"])
+    assert sorted(user_links, key=lambda item: item["link_id"]) == [
+        {"link_id": "link-1"},
+        {"link_id": "link-2"},
+    ]
 
     links_repo.mark_disabled("link-1")
     assert links_repo.get("link-1")["status"] == "DISABLED"
@@ -326,10 +222,8 @@ def test_payment_links_list_by_user_and_status_updates():
     assert links_repo.get("link-2")["status"] == "EXPIRED"
 
 
-@mock_aws
-def test_subscriptions_list_by_user_and_status_updates():
-    _create_tables()
-    subs_repo = SubscriptionsRepository()
+def test_subscription_create_and_get(boto_session):
+    subs_repo = SubscriptionsRepository(session=boto_session)
 
     subs_repo.create(
         subscription_id="sub-1",
@@ -342,40 +236,65 @@ def test_subscriptions_list_by_user_and_status_updates():
         service_fee=5,
         currency="usd",
         interval="month",
-        expires_at=None,
+        expires_at=_NOW,
         require_fields=["email", "name"],
     )
-    subs_repo.create(
-        subscription_id="sub-2",
-        user_id="user-1",
-        stripe_payment_link_id="plink_2",
-        url="https://example.com",
-        title="Sub 2",
-        description=None,
-        amount=200,
-        service_fee=10,
-        currency="usd",
-        interval="month",
-        expires_at=None,
-        require_fields=["email", "name"],
+
+    item = subs_repo.get("sub-1")
+    assert item is not None
+    assert item["user_id"] == "user-1"
+    assert item["stripe_payment_link_id"] == "plink_1"
+    assert item["amount"] == 100
+    assert item["interval"] == "month"
+    assert item["status"] == "ACTIVE"
+    assert item["expires_at"] == _NOW_TS
+
+
+def test_subscriptions_create_many(boto_session):
+    subs_repo = SubscriptionsRepository(session=boto_session)
+
+    subscription_ids = subs_repo.create_many(
+        [
+            {
+                "subscription_id": f"sub-{n}",
+                "user_id": "user-1",
+                "stripe_payment_link_id": f"plink_{n}",
+                "url": "https://example.com",
+                "title": "Sub",
+                "description": None,
+                "amount": 100 * n,
+                "service_fee": 5 * n,
+                "currency": "usd",
+                "interval": "month",
+                "expires_at": None,
+                "require_fields": ["email", "name"],
+            }
+            for n in (1, 2)
+        ]
     )
-    subs_repo.create(
-        subscription_id="sub-3",
-        user_id="user-2",
-        stripe_payment_link_id="plink_3",
-        url="https://example.com",
-        title="Other",
-        description=None,
-        amount=300,
-        service_fee=15,
-        currency="usd",
-        interval="month",
-        expires_at=None,
-        require_fields=["email", "name"],
+
+    assert subscription_ids == ["sub-1", "sub-2"]
+    item = subs_repo.get("sub-2")
+    assert item["amount"] == 200
+    assert item["interval"] == "month"
+
+
+def test_subscriptions_list_by_user_and_status_updates(boto_session, seed):
+    subs_repo = SubscriptionsRepository(session=boto_session)
+    seed(
+        "payme-subscription-links",
+        [
+            {"subscription_id": "sub-1", "user_id": "user-1", "status": "ACTIVE", "amount": 100, "title": "Sub"},
+            {"subscription_id": "sub-2", "user_id": "user-1", "status": "ACTIVE", "amount": 200, "title": "Sub"},
+            {"subscription_id": "sub-3", "user_id": "user-2", "status": "ACTIVE", "amount": 300, "title": "Sub"},
+        ],
     )
 
-    user_links = subs_repo.list_by_user("user-1")
-    assert {item["subscription_id"] for item in user_links} == {"sub-1", "sub-2"}
+    user_links = subs_repo.list_by_user("user-1", attributes=["subscription_id"])
+    assert sorted(user_links, key=lambda item: item["subscription_id"]) == [
+        {"subscription_id": "sub-1"},
+        {"subscription_id": "sub-2"},
+    ]
 
     subs_repo.mark_disabled("sub-1")
     assert subs_repo.get("sub-1")["status"] == "DISABLED"
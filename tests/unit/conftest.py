@@ -0,0 +1,37 @@
+"""Shared fixtures for unit tests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+
+from payme.api.main import app
+
+
+@pytest.fixture(autouse=True)
+def _reset_overrides() -> Iterator[None]:
+    """Drop dependency overrides after every test, even when an assertion fails first."""
+    yield
+    app.dependency_overrides.clear()
+
+
+def _returning(value: Any) -> Callable[[], Any]:
+    # A zero-argument closure: FastAPI would read a ``lambda _v=v: _v`` default as a query parameter.
+    return lambda: value
+
+
+@pytest.fixture
+def override() -> Iterator[Callable[[dict[Callable[..., Any], Any]], None]]:
+    """Apply ``{dependency: value}`` overrides in one call; each dependency then resolves to its value."""
+    applied: list[Callable[..., Any]] = []
+
+    def _apply(mapping: dict[Callable[..., Any], Any]) -> None:
+        for dependency, value in mapping.items():
+            app.dependency_overrides[dependency] = _returning(value)
+            applied.append(dependency)
+
+    yield _apply
+    for dependency in applied:
+        app.dependency_overrides.pop(dependency, None)
@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import date, datetime, timezone
+from types import SimpleNamespace
 from typing import Any
 from unittest.mock import MagicMock
 
+import pytest
 import stripe
 from fastapi.testclient import TestClient
 
+from payme.api import dependencies as deps
 from payme.api.dependencies import (
     get_stripe_connected_account_link_service_optional,
     get_stripe_platform_account_link_service,
 )
-from payme.api.main import app
 from payme.api.utils import normalize_expiry_date, stripe_error_message
 from payme.core.auth import Principal
 from payme.models.payment import PaymentLinkCreate, RefundRequest, SubscriptionCreate
@@ -146,6 +149,32 @@ class FakeSubsRepo:
         return self.list_by_user_items
 
 
+@pytest.fixture
+def links_repo() -> FakeLinksRepo:
+    return FakeLinksRepo()
+
+
+@pytest.fixture
+def subs_repo() -> FakeSubsRepo:
+    return FakeSubsRepo()
+
+
+class _Recorder:
+    """Plain stand-in for a repository: every public method call is recorded as ``(name, args, kwargs)``."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def record(*args: Any, **kwargs: Any) -> None:
+            self.calls.append((name, args, kwargs))
+
+        return record
+
+
 class FakeLinkService:
     """Fake for StripePaymentLinkService (factory-returned link service)."""
 
@@ -225,21 +254,84 @@ class FakeStripePlatformAccountLinkService:
         return True
 
 
+class _FakePlatformServiceNoop:
+    """Platform service class whose Stripe calls do nothing (for routes that only need it wired)."""
+
+    @staticmethod
+    def disable_platform_payment_link(link_id: str) -> None:
+        pass
+
+    @staticmethod
+    def delete_connected_account(stripe_account_id: str) -> None:
+        pass
+
+
+class FakePayoutAccountsRepo:
+    """Records clear_pending_earnings calls; with allow_clear=False any call fails the test."""
+
+    def __init__(self, allow_clear: bool = True) -> None:
+        self.allow_clear = allow_clear
+        self.cleared: list[tuple[str, Any]] = []
+
+    def clear_pending_earnings(self, user_id: str, only_currencies: Any = None) -> None:
+        if not self.allow_clear:
+            raise AssertionError("clear_pending_earnings should not be called")
+        self.cleared.append((user_id, only_currencies))
+
+
+class FakePayoutPlatformService:
+    """Platform service returning a canned payout result / schedule and recording its calls."""
+
+    def __init__(self, payout_result: dict[str, Any] | None = None, schedule: dict[str, Any] | None = None) -> None:
+        self.payout_result = payout_result or {"transferred": {}, "failed": {}, "payout_ids": {}}
+        self.schedule = schedule
+        self.payout_calls: list[str] = []
+        self.schedule_calls: list[dict[str, Any]] = []
+
+    def create_payouts_from_available_balance(self, stripe_account_id: str) -> dict[str, Any]:
+        self.payout_calls.append(stripe_account_id)
+        return self.payout_result
+
+    def update_payout_schedule(
+        self,
+        stripe_account_id: str,
+        interval: str,
+        weekly_anchor: str | None = None,
+        monthly_anchor: int | None = None,
+    ) -> dict[str, Any]:
+        self.schedule_calls.append(
+            {
+                "stripe_account_id": stripe_account_id,
+                "interval": interval,
+                "weekly_anchor": weekly_anchor,
+                "monthly_anchor": monthly_anchor,
+            }
+        )
+        return self.schedule if self.schedule is not None else {"interval": interval}
+
+
 # ---------------------------------------------------------------------------
 # Test client with auth override
 # ---------------------------------------------------------------------------
 
-# Principal with Stripe account (for routes that need require_principal() - status must be VERIFIED or RESTRICTED)
-def _principal_with_account() -> Principal:
+# Read-only: shared by reference; build a new record in any test that needs to mutate one.
+_ACCT_VERIFIED = FakeStripeAccountRecord("user-1", "acct_123", status="VERIFIED")
+
+
+# Principal with Stripe account (for routes that need require_principal() - status must be VERIFIED or RESTRICTED).
+# Principal is frozen and no route mutates it, so one instance per session is enough.
+@pytest.fixture(scope="session")
+def principal_with_account() -> Principal:
     return Principal(
         user_id="user-1",
         email="test@example.com",
         external_sub="sub-cognito",
-        stripe_account=FakeStripeAccountRecord("user-1", "acct_123", status="VERIFIED"),
+        stripe_account=_ACCT_VERIFIED,
     )
 
 
-def _principal_without_account() -> Principal:
+@pytest.fixture(scope="session")
+def principal_without_account() -> Principal:
     return Principal(
         user_id="user-1",
         email="test@example.com",
@@ -248,8 +340,19 @@ def _principal_without_account() -> Principal:
     )
 
 
-def override_get_resolved_principal() -> Principal:
-    return _principal_with_account()
+# Request bodies reused across tests, serialised once.
+_HDRS = {"Authorization": "Bearer x", "content-type": "application/json"}
+_BODY_CONNECT = b'{"country":"GB"}'
+_BODY_LINK = b'{"amount":100,"currency":"gbp"}'
+_BODY_SUBSCRIPTION = b'{"amount":200,"currency":"usd","interval":"month"}'
+_BASE_LINK = {"amount": 100, "currency": "gbp"}
+
+
+def _post_link(client: TestClient, **overrides: Any) -> Any:
+    """POST /payment-links with ``_BASE_LINK`` merged with ``overrides`` (prebuilt bytes when there are none)."""
+    if not overrides:
+        return client.post("/api/v1/payment-links", headers=_HDRS, content=_BODY_LINK)
+    return client.post("/api/v1/payment-links", headers=_HDRS, json={**_BASE_LINK, **overrides})
 
 
 # ---------------------------------------------------------------------------
@@ -264,26 +367,32 @@ def test_normalize_expiry_date() -> None:
     assert value.hour == 23 and value.minute == 59 and value.second == 59
 
 
-def test_stripe_error_message_prefers_user_message() -> None:
-    exc = MagicMock(spec=stripe.error.StripeError, user_message="user message", error=None)
-    assert stripe_error_message(exc) == "user message"
-
-
-def test_stripe_error_message_falls_back_to_error_message() -> None:
-    err = MagicMock(message="boom")
-    exc = MagicMock(spec=stripe.error.StripeError, user_message=None, error=err)
-    assert stripe_error_message(exc) == "boom"
-
-
-def test_stripe_error_message_falls_back_to_str() -> None:
-    class Dummy:
-        user_message = None
-        error = None
-
-        def __str__(self) -> str:
-            return "fallback"
-
-    assert stripe_error_message(Dummy()) == "fallback"
+class _StrOnlyError:
+    user_message = None
+    error = None
+
+    def __str__(self) -> str:
+        return "fallback"
+
+
+@pytest.mark.parametrize(
+    "make_exc, expected",
+    [
+        pytest.param(
+            lambda: MagicMock(spec=stripe.error.StripeError, user_message="user message", error=None),
+            "user message",
+            id="prefers_user_message",
+        ),
+        pytest.param(
+            lambda: MagicMock(spec=stripe.error.StripeError, user_message=None, error=MagicMock(message="boom")),
+            "boom",
+            id="falls_back_to_error_message",
+        ),
+        pytest.param(_StrOnlyError, "fallback", id="falls_back_to_str"),
+    ],
+)
+def test_stripe_error_message(make_exc: Callable[[], Any], expected: str) -> None:
+    assert stripe_error_message(make_exc()) == expected
 
 
 # ---------------------------------------------------------------------------
@@ -291,8 +400,7 @@ def test_stripe_error_message_falls_back_to_str() -> None:
 # ---------------------------------------------------------------------------
 
 
-def test_health() -> None:
-    client = TestClient(app)
+def test_health(client: TestClient) -> None:
     r = client.get("/api/v1/health")
     assert r.status_code == 200
     assert r.json() == {"status": "ok"}
@@ -303,9 +411,11 @@ def test_health() -> None:
 # ---------------------------------------------------------------------------
 
 
-def test_connect_account_uses_override(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
-
+def test_connect_account_uses_override(
+    client: TestClient,
+    principal_without_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
     class FakePlatformService:
         @staticmethod
         def create_custom_connected_account(email: str, country: str) -> str:
@@ -314,18 +424,20 @@ def test_connect_account_uses_override(monkeypatch: Any) -> None:
     users_repo = FakeUsersRepo(FakeUserRecord("user-1", "test@example.com", None))
     accounts_repo = FakeStripeAccountsRepo(None)
 
-    app.dependency_overrides[deps.get_resolved_principal] = lambda: _principal_without_account()
-    app.dependency_overrides[deps.get_users_repository] = lambda: users_repo
-    app.dependency_overrides[deps.get_stripe_accounts_repository] = lambda: accounts_repo
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: FakePlatformService
+    override(
+        {
+            deps.get_resolved_principal: principal_without_account,
+            deps.get_users_repository: users_repo,
+            deps.get_stripe_accounts_repository: accounts_repo,
+            deps.get_stripe_platform_account_service: FakePlatformService,
+        }
+    )
 
-    client = TestClient(app)
     r = client.post(
         "/api/v1/platform/connected-accounts",
-        headers={"Authorization": "Bearer x"},
-        json={"country": "GB"},
+        headers=_HDRS,
+        content=_BODY_CONNECT,
     )
-    app.dependency_overrides.clear()
     assert r.status_code == 200
     assert r.json()["stripe_account_id"] == "acct_fake"
     assert users_repo.updated == "acct_fake"
@@ -334,9 +446,10 @@ def test_connect_account_uses_override(monkeypatch: Any) -> None:
     assert accounts_repo.created[0]["stripe_account_id"] == "acct_fake"
 
 
-def test_connect_account_missing_email_returns_400(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
-
+def test_connect_account_missing_email_returns_400(
+    client: TestClient,
+    override: Callable[[dict], None],
+) -> None:
     principal_no_email = Principal(
         user_id="user-1",
         email=None,
@@ -345,52 +458,61 @@ def test_connect_account_missing_email_returns_400(monkeypatch: Any) -> None:
     )
     users_repo = FakeUsersRepo(None)
     accounts_repo = FakeStripeAccountsRepo(None)
-    app.dependency_overrides[deps.get_resolved_principal] = lambda: principal_no_email
-    app.dependency_overrides[deps.get_users_repository] = lambda: users_repo
-    app.dependency_overrides[deps.get_stripe_accounts_repository] = lambda: accounts_repo
+    override(
+        {
+            deps.get_resolved_principal: principal_no_email,
+            deps.get_users_repository: users_repo,
+            deps.get_stripe_accounts_repository: accounts_repo,
+        }
+    )
 
-    client = TestClient(app)
     r = client.post(
         "/api/v1/platform/connected-accounts",
-        headers={"Authorization": "Bearer x"},
-        json={"country": "GB"},
+        headers=_HDRS,
+        content=_BODY_CONNECT,
     )
-    app.dependency_overrides.clear()
     assert r.status_code == 400
     assert "email" in r.json()["detail"].lower()
 
 
-def test_connect_account_returns_existing_account(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
-
+def test_connect_account_returns_existing_account(
+    client: TestClient,
+    override: Callable[[dict], None],
+) -> None:
     principal_existing = Principal(
         user_id="user-1",
         email="test@example.com",
         external_sub="sub-cognito",
         stripe_account=FakeStripeAccountRecord("user-1", "acct_existing"),
     )
-    app.dependency_overrides[deps.get_resolved_principal] = lambda: principal_existing
+    override(
+        {
+            deps.get_resolved_principal: principal_existing,
+        }
+    )
 
-    client = TestClient(app)
     r = client.post(
         "/api/v1/platform/connected-accounts",
-        headers={"Authorization": "Bearer x"},
-        json={"country": "GB"},
+        headers=_HDRS,
+        content=_BODY_CONNECT,
     )
-    app.dependency_overrides.clear()
     assert r.status_code == 200
     assert r.json()["stripe_account_id"] == "acct_existing"
 
 
-def test_create_onboarding_link_requires_account(monkeypatch: Any) -> None:
+def test_create_onboarding_link_requires_account(
+    client: TestClient,
+    principal_without_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
     """Onboarding link requires Stripe account; returns 403 when none."""
-    from payme.api import dependencies as deps
-
-    app.dependency_overrides[deps.get_resolved_principal] = lambda: _principal_without_account()
+    override(
+        {
+            deps.get_resolved_principal: principal_without_account,
+        }
+    )
 
-    client = TestClient(app)
     r = client.post("/api/v1/accounts/onboarding", headers={"Authorization": "Bearer x"})
-    app.dependency_overrides.clear()
     assert r.status_code == 403
     # 403 Stripe account required: app returns payload as body (no "detail" wrapper)
     body = r.json()
@@ -398,284 +520,275 @@ def test_create_onboarding_link_requires_account(monkeypatch: Any) -> None:
     assert "setup" in msg or "complete" in msg
 
 
-def test_create_onboarding_link_success(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
-
+def test_create_onboarding_link_success(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
     class FakePlatformServiceWithOnboarding:
         @staticmethod
         def create_account_link(stripe_account_id: str) -> str:
             return "https://stripe.example.com/onboard"
 
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: FakePlatformServiceWithOnboarding
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_stripe_platform_account_service: FakePlatformServiceWithOnboarding,
+        }
+    )
 
-    client = TestClient(app)
     r = client.post("/api/v1/accounts/onboarding", headers={"Authorization": "Bearer x"})
-    app.dependency_overrides.clear()
     assert r.status_code == 200
     assert "onboarding_url" in r.json()
     assert "stripe.example.com" in r.json()["onboarding_url"]
 
 
-def test_delete_account_deletes_user_data_and_cognito(monkeypatch: Any) -> None:
-    """DELETE /accounts/account hard-deletes DynamoDB data, Stripe account, identities, and Cognito user."""
-    from unittest.mock import MagicMock
-
-    from payme.api import dependencies as deps
-
-    principal = Principal(
-        user_id="user-del",
-        email="del@example.com",
-        external_sub="cognito-sub-123",
-        stripe_account=FakeStripeAccountRecord("user-del", "acct_xyz", status="VERIFIED"),
-    )
-    users_repo = MagicMock(spec=["delete"])
-    user_identities_repo = MagicMock(spec=["delete_all_for_user"])
-    stripe_accounts_repo = MagicMock(spec=["delete"])
-    payment_links_repo = MagicMock(spec=["delete_all_for_user"])
-    subscriptions_repo = MagicMock(spec=["delete_all_for_user"])
-    stripe_subscriptions_repo = MagicMock(spec=["delete_all_for_user"])
-    transactions_repo = MagicMock(spec=["delete_all_for_user"])
-    platform_service_class = MagicMock()
-    cognito_delete_user = MagicMock()
-
-    app.dependency_overrides[deps.get_resolved_principal] = lambda: principal
-    app.dependency_overrides[deps.get_users_repository] = lambda: users_repo
-    app.dependency_overrides[deps.get_user_identities_repository] = lambda: user_identities_repo
-    app.dependency_overrides[deps.get_stripe_accounts_repository] = lambda: stripe_accounts_repo
-    app.dependency_overrides[deps.get_payment_links_repository] = lambda: payment_links_repo
-    app.dependency_overrides[deps.get_subscriptions_repository] = lambda: subscriptions_repo
-    app.dependency_overrides[deps.get_stripe_subscriptions_repository] = lambda: stripe_subscriptions_repo
-    app.dependency_overrides[deps.get_transactions_repository] = lambda: transactions_repo
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: platform_service_class
-    monkeypatch.setattr(
-        "payme.api.v1.routes.accounts.cognito_delete_user",
-        cognito_delete_user,
-    )
-
-    client = TestClient(app)
-    r = client.delete("/api/v1/accounts/account", headers={"Authorization": "Bearer x"})
-
-    app.dependency_overrides.clear()
-    assert r.status_code == 204
-    platform_service_class.delete_connected_account.assert_called_once_with("acct_xyz")
-    transactions_repo.delete_all_for_user.assert_called_once_with("user-del")
-    payment_links_repo.delete_all_for_user.assert_called_once_with("user-del")
-    subscriptions_repo.delete_all_for_user.assert_called_once_with("user-del")
-    stripe_subscriptions_repo.delete_all_for_user.assert_called_once_with("user-del")
-    stripe_accounts_repo.delete.assert_called_once_with("user-del")
-    user_identities_repo.delete_all_for_user.assert_called_once_with("user-del")
-    users_repo.delete.assert_called_once_with("user-del")
-    cognito_delete_user.assert_called_once_with("cognito-sub-123")
-
-
-def test_delete_account_no_stripe_account_skips_stripe_delete(monkeypatch: Any) -> None:
-    """When user has no Stripe account, delete_account does not call Stripe."""
-    from unittest.mock import MagicMock
-
-    from payme.api import dependencies as deps
-
-    principal = Principal(
-        user_id="user-no-acct",
-        email="n@example.com",
-        external_sub="sub-456",
-        stripe_account=None,
+@pytest.fixture
+def delete_ctx(override: Callable[[dict], None]) -> SimpleNamespace:
+    """Recorded repositories and a mocked platform service wired up for DELETE /accounts/account."""
+    ctx = SimpleNamespace(
+        users_repo=_Recorder(),
+        user_identities_repo=_Recorder(),
+        stripe_accounts_repo=_Recorder(),
+        payment_links_repo=_Recorder(),
+        subscriptions_repo=_Recorder(),
+        stripe_subscriptions_repo=_Recorder(),
+        transactions_repo=_Recorder(),
+        platform_service_class=MagicMock(),
     )
-    users_repo = MagicMock(spec=["delete"])
-    user_identities_repo = MagicMock(spec=["delete_all_for_user"])
-    stripe_accounts_repo = MagicMock(spec=["delete"])
-    payment_links_repo = MagicMock(spec=["delete_all_for_user"])
-    subscriptions_repo = MagicMock(spec=["delete_all_for_user"])
-    stripe_subscriptions_repo = MagicMock(spec=["delete_all_for_user"])
-    transactions_repo = MagicMock(spec=["delete_all_for_user"])
-    platform_service_class = MagicMock()
-    cognito_delete_user = MagicMock()
-
-    app.dependency_overrides[deps.get_resolved_principal] = lambda: principal
-    app.dependency_overrides[deps.get_users_repository] = lambda: users_repo
-    app.dependency_overrides[deps.get_user_identities_repository] = lambda: user_identities_repo
-    app.dependency_overrides[deps.get_stripe_accounts_repository] = lambda: stripe_accounts_repo
-    app.dependency_overrides[deps.get_payment_links_repository] = lambda: payment_links_repo
-    app.dependency_overrides[deps.get_subscriptions_repository] = lambda: subscriptions_repo
-    app.dependency_overrides[deps.get_stripe_subscriptions_repository] = lambda: stripe_subscriptions_repo
-    app.dependency_overrides[deps.get_transactions_repository] = lambda: transactions_repo
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: platform_service_class
-    monkeypatch.setattr(
-        "payme.api.v1.routes.accounts.cognito_delete_user",
-        cognito_delete_user,
-    )
-
-    client = TestClient(app)
-    r = client.delete("/api/v1/accounts/account", headers={"Authorization": "Bearer x"})
-
-    app.dependency_overrides.clear()
-    assert r.status_code == 204
-    platform_service_class.delete_connected_account.assert_not_called()
-    user_identities_repo.delete_all_for_user.assert_called_once_with("user-no-acct")
-    cognito_delete_user.assert_called_once_with("sub-456")
-
-
-def test_delete_account_stripe_delete_failure_continues(monkeypatch: Any) -> None:
-    """Stripe delete failures are logged but do not block hard deletion."""
-    from unittest.mock import MagicMock
-
-    from payme.api import dependencies as deps
-
-    principal = Principal(
-        user_id="user-del-fail",
-        email="del-fail@example.com",
-        external_sub="cognito-sub-fail",
-        stripe_account=FakeStripeAccountRecord("user-del-fail", "acct_fail", status="VERIFIED"),
-    )
-    users_repo = MagicMock(spec=["delete"])
-    user_identities_repo = MagicMock(spec=["delete_all_for_user"])
-    stripe_accounts_repo = MagicMock(spec=["delete"])
-    payment_links_repo = MagicMock(spec=["delete_all_for_user"])
-    subscriptions_repo = MagicMock(spec=["delete_all_for_user"])
-    stripe_subscriptions_repo = MagicMock(spec=["delete_all_for_user"])
-    transactions_repo = MagicMock(spec=["delete_all_for_user"])
-    platform_service_class = MagicMock()
-    platform_service_class.delete_connected_account.side_effect = RuntimeError("stripe down")
-    cognito_delete_user = MagicMock()
-
-    app.dependency_overrides[deps.get_resolved_principal] = lambda: principal
-    app.dependency_overrides[deps.get_users_repository] = lambda: users_repo
-    app.dependency_overrides[deps.get_user_identities_repository] = lambda: user_identities_repo
-    app.dependency_overrides[deps.get_stripe_accounts_repository] = lambda: stripe_accounts_repo
-    app.dependency_overrides[deps.get_payment_links_repository] = lambda: payment_links_repo
-    app.dependency_overrides[deps.get_subscriptions_repository] = lambda: subscriptions_repo
-    app.dependency_overrides[deps.get_stripe_subscriptions_repository] = lambda: stripe_subscriptions_repo
-    app.dependency_overrides[deps.get_transactions_repository] = lambda: transactions_repo
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: platform_service_class
-    monkeypatch.setattr(
-        "payme.api.v1.routes.accounts.cognito_delete_user",
-        cognito_delete_user,
-    )
-
-    client = TestClient(app)
-    r = client.delete("/api/v1/accounts/account", headers={"Authorization": "Bearer x"})
-
-    app.dependency_overrides.clear()
-    assert r.status_code == 204
-    stripe_accounts_repo.delete.assert_called_once_with("user-del-fail")
-    user_identities_repo.delete_all_for_user.assert_called_once_with("user-del-fail")
-    users_repo.delete.assert_called_once_with("user-del-fail")
-    cognito_delete_user.assert_called_once_with("cognito-sub-fail")
-
-
-# ---------------------------------------------------------------------------
-# Payment links (get_principal)
-# ---------------------------------------------------------------------------
+    override(
+        {
+            deps.get_users_repository: ctx.users_repo,
+            deps.get_user_identities_repository: ctx.user_identities_repo,
+            deps.get_stripe_accounts_repository: ctx.stripe_accounts_repo,
+            deps.get_payment_links_repository: ctx.payment_links_repo,
+            deps.get_subscriptions_repository: ctx.subscriptions_repo,
+            deps.get_stripe_subscriptions_repository: ctx.stripe_subscriptions_repo,
+            deps.get_transactions_repository: ctx.transactions_repo,
+            deps.get_stripe_platform_account_service: ctx.platform_service_class,
+        }
+    )
+    return ctx
 
 
-def test_create_payment_link_success_no_account_uses_platform(monkeypatch: Any) -> None:
-    """Creating payment link with RESTRICTED (non-VERIFIED) account uses platform link service and returns 200."""
-    from payme.api import dependencies as deps
+def _delete_principal(user_id: str, external_sub: str, stripe_account: FakeStripeAccountRecord | None) -> Principal:
+    return Principal(
+        user_id=user_id,
+        email=f"{user_id}@example.com",
+        external_sub=external_sub,
+        stripe_account=stripe_account,
+    )
 
-    links_repo = FakeLinksRepo()
-    link_fake = FakeLinkService(is_platform=True)
 
-    def principal_restricted() -> Principal:
-        return Principal(
-            user_id="user-1",
-            email="test@example.com",
-            external_sub="sub-cognito",
-            stripe_account=FakeStripeAccountRecord("user-1", "acct_123", status="RESTRICTED"),
+class TestDeleteAccount:
+    @pytest.fixture(autouse=True)
+    def _patch_cognito(self, monkeypatch: Any) -> None:
+        self.cognito = MagicMock()
+        monkeypatch.setattr("payme.api.v1.routes.accounts.cognito_delete_user", self.cognito)
+
+    @pytest.mark.parametrize(
+        "stripe_account, expect_stripe_delete",
+        [
+            pytest.param(
+                FakeStripeAccountRecord("user-del", "acct_xyz", status="VERIFIED"), True, id="with_stripe_account"
+            ),
+            pytest.param(None, False, id="no_stripe_account_skips_stripe_delete"),
+        ],
+    )
+    def test_delete_account_deletes_user_data_and_cognito(
+        self,
+        client: TestClient,
+        override: Callable[[dict], None],
+        delete_ctx: SimpleNamespace,
+        stripe_account: FakeStripeAccountRecord | None,
+        expect_stripe_delete: bool,
+    ) -> None:
+        """DELETE /accounts/account hard-deletes DynamoDB data, Stripe account (if any), identities, and Cognito user."""
+        override({deps.get_resolved_principal: _delete_principal("user-del", "cognito-sub-123", stripe_account)})
+
+        r = client.delete("/api/v1/accounts/account", headers={"Authorization": "Bearer x"})
+
+        assert r.status_code == 204
+        if expect_stripe_delete:
+            delete_ctx.platform_service_class.delete_connected_account.assert_called_once_with("acct_xyz")
+        else:
+            delete_ctx.platform_service_class.delete_connected_account.assert_not_called()
+        assert delete_ctx.transactions_repo.calls == [("delete_all_for_user", ("user-del",), {})]
+        assert delete_ctx.payment_links_repo.calls == [("delete_all_for_user", ("user-del",), {})]
+        assert delete_ctx.subscriptions_repo.calls == [("delete_all_for_user", ("user-del",), {})]
+        assert delete_ctx.stripe_subscriptions_repo.calls == [("delete_all_for_user", ("user-del",), {})]
+        assert delete_ctx.stripe_accounts_repo.calls == [("delete", ("user-del",), {})]
+        assert delete_ctx.user_identities_repo.calls == [("delete_all_for_user", ("user-del",), {})]
+        assert delete_ctx.users_repo.calls == [("delete", ("user-del",), {})]
+        self.cognito.assert_called_once_with("cognito-sub-123")
+
+    def test_delete_account_stripe_delete_failure_continues(
+        self,
+        client: TestClient,
+        override: Callable[[dict], None],
+        delete_ctx: SimpleNamespace,
+    ) -> None:
+        """Stripe delete failures are logged but do not block hard deletion."""
+        delete_ctx.platform_service_class.delete_connected_account.side_effect = RuntimeError("stripe down")
+        override(
+            {
+                deps.get_resolved_principal: _delete_principal(
+                    "user-del-fail",
+                    "cognito-sub-fail",
+                    FakeStripeAccountRecord("user-del-fail", "acct_fail", status="VERIFIED"),
+                ),
+            }
         )
 
-    app.dependency_overrides[deps.get_resolved_principal] = principal_restricted
-    app.dependency_overrides[deps.get_payment_links_repository] = lambda: links_repo
-    app.dependency_overrides[deps.get_stripe_link_service] = lambda: link_fake
-
-    client = TestClient(app)
-    r = client.post(
-        "/api/v1/payment-links",
-        headers={"Authorization": "Bearer x"},
-        json={"amount": 100, "currency": "gbp"},
-    )
-    app.dependency_overrides.clear()
-    assert r.status_code == 200
-    assert r.json()["amount"] == 100
-    assert len(link_fake.created_one_time) == 1
-    assert link_fake.created_one_time[0]["amount"] == 140  # amount 100 + tiered fixed fee 40
+        r = client.delete("/api/v1/accounts/account", headers={"Authorization": "Bearer x"})
 
+        assert r.status_code == 204
+        assert delete_ctx.stripe_accounts_repo.calls == [("delete", ("user-del-fail",), {})]
+        assert delete_ctx.user_identities_repo.calls == [("delete_all_for_user", ("user-del-fail",), {})]
+        assert delete_ctx.users_repo.calls == [("delete", ("user-del-fail",), {})]
+        self.cognito.assert_called_once_with("cognito-sub-fail")
 
-def test_create_payment_link_success(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
 
-    links_repo = FakeLinksRepo()
-    link_fake = FakeLinkService(is_platform=False)  # connected account path
+def test_get_account_transfers_pending_per_currency_and_keeps_failures(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
+    """GET /accounts/account transfers each pending currency; only successful ones are cleared."""
+    repo = MagicMock()
+    repo.get_pending_earnings.side_effect = [{"gbp": 1000, "usd": 500, "eur": 0}, {"usd": 500}]
+    repo.get_earnings.return_value = {"gbp": 1000}
 
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_payment_links_repository] = lambda: links_repo
-    app.dependency_overrides[deps.get_stripe_link_service] = lambda: link_fake
+    class FakePlatformService:
+        @staticmethod
+        def create_transfer(amount: int, currency: str, destination: str) -> str:
+            if currency == "usd":
+                raise RuntimeError("stripe down")
+            return f"tr_{currency}"
 
-    client = TestClient(app)
-    r = client.post(
-        "/api/v1/payment-links",
-        headers={"Authorization": "Bearer x"},
-        json={"amount": 100, "currency": "gbp"},
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_stripe_accounts_repository: repo,
+            deps.get_stripe_platform_account_service: FakePlatformService,
+        }
     )
-    app.dependency_overrides.clear()
-    assert r.status_code == 200, r.json()
-    data = r.json()
-    assert data["service_fee"] == 40  # tiered fixed fee
-    assert data["amount"] == 100
-    assert len(links_repo.created) >= 1
-    assert len(link_fake.created_one_time) == 1
-    assert link_fake.created_one_time[0]["amount"] == 140  # amount + tiered fixed fee
 
+    r = client.get("/api/v1/accounts/account", headers={"Authorization": "Bearer x"})
 
-def test_create_payment_link_title_optional(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
+    assert r.status_code == 200, r.json()
+    body = r.json()
+    assert body["pending_earnings_status"] == "in_progress"
+    assert body["pending_earnings"] == {"usd": 500}
+    repo.clear_pending_earnings.assert_called_once_with("user-1", only_currencies=("gbp",))
 
-    links_repo = FakeLinksRepo()
-    link_fake = FakeLinkService(is_platform=False)
 
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_payment_links_repository] = lambda: links_repo
-    app.dependency_overrides[deps.get_stripe_link_service] = lambda: link_fake
+# ---------------------------------------------------------------------------
+# Payment links (get_principal)
+# ---------------------------------------------------------------------------
 
-    client = TestClient(app)
-    r = client.post(
-        "/api/v1/payment-links",
-        headers={"Authorization": "Bearer x"},
-        json={"amount": 100, "currency": "gbp", "title": "  Test  "},
-    )
-    app.dependency_overrides.clear()
-    assert r.status_code == 200
-    assert r.json()["title"] == "Test"
-    assert len(link_fake.created_one_time) == 1
-    assert link_fake.created_one_time[0]["title"] == "Test"
 
+_PRINCIPAL_RESTRICTED = Principal(
+    user_id="user-1",
+    email="test@example.com",
+    external_sub="sub-cognito",
+    stripe_account=FakeStripeAccountRecord("user-1", "acct_123", status="RESTRICTED"),
+)
 
-def test_create_quick_payment_link_success_without_dynamo(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
 
-    link_fake = FakeLinkService(is_platform=False)
+class TestPaymentLinks:
+    """Link-creation routes; the principal, repository and link-service overrides are installed per test."""
 
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_stripe_link_service] = lambda: link_fake
+    @pytest.fixture(autouse=True)
+    def _common(
+        self,
+        override: Callable[[dict], None],
+        principal_with_account: Principal,
+        links_repo: FakeLinksRepo,
+        subs_repo: FakeSubsRepo,
+    ) -> None:
+        self.links_repo = links_repo
+        self.subs_repo = subs_repo
+        self.link_fake = FakeLinkService(is_platform=False)  # connected account path
+        override(
+            {
+                deps.get_resolved_principal: principal_with_account,
+                deps.get_payment_links_repository: links_repo,
+                deps.get_subscriptions_repository: subs_repo,
+                deps.get_stripe_link_service: self.link_fake,
+            }
+        )
 
-    client = TestClient(app)
-    r = client.post(
-        "/api/v1/payment-links/quick-payments",
-        headers={"Authorization": "Bearer x"},
-        json={"title": "Quick Piano Payment", "amount": 100, "currency": "bgn"},
+    @pytest.mark.parametrize(
+        "restricted, body_overrides, expected_title",
+        [
+            # RESTRICTED (non-VERIFIED) account uses the platform link service.
+            pytest.param(True, {}, None, id="restricted_uses_platform"),
+            pytest.param(False, {}, None, id="verified_uses_connected_account"),
+            pytest.param(False, {"title": "  Test  "}, "Test", id="title_optional_is_stripped"),
+        ],
     )
-    app.dependency_overrides.clear()
-
-    assert r.status_code == 200, r.json()
-    assert r.json()["url"] == "https://example.com"
-    assert len(link_fake.created_one_time) == 1
-    assert link_fake.created_one_time[0]["title"] == "Quick Piano Payment"
-    assert link_fake.created_one_time[0]["amount"] == 140  # amount + tiered fixed fee
-
-
-def test_list_payment_links_sorted(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
+    def test_create_payment_link(
+        self,
+        client: TestClient,
+        override: Callable[[dict], None],
+        restricted: bool,
+        body_overrides: dict[str, Any],
+        expected_title: str | None,
+    ) -> None:
+        if restricted:
+            self.link_fake = FakeLinkService(is_platform=True)
+            override(
+                {
+                    deps.get_resolved_principal: _PRINCIPAL_RESTRICTED,
+                    deps.get_stripe_link_service: self.link_fake,
+                }
+            )
+
+        r = _post_link(client, **body_overrides)
+        assert r.status_code == 200, r.json()
+        data = r.json()
+        assert data["amount"] == 100
+        assert data["service_fee"] == 40  # tiered fixed fee
+        assert len(self.links_repo.created) >= 1
+        assert len(self.link_fake.created_one_time) == 1
+        assert self.link_fake.created_one_time[0]["amount"] == 140  # amount 100 + tiered fixed fee 40
+        if expected_title is not None:
+            assert data["title"] == expected_title
+            assert self.link_fake.created_one_time[0]["title"] == expected_title
+
+    def test_create_quick_payment_link_success_without_dynamo(self, client: TestClient) -> None:
+        r = client.post(
+            "/api/v1/payment-links/quick-payments",
+            headers={"Authorization": "Bearer x"},
+            json={"title": "Quick Piano Payment", "amount": 100, "currency": "bgn"},
+        )
 
-    links_repo = FakeLinksRepo()
+        assert r.status_code == 200, r.json()
+        assert r.json()["url"] == "https://example.com"
+        assert len(self.link_fake.created_one_time) == 1
+        assert self.link_fake.created_one_time[0]["title"] == "Quick Piano Payment"
+        assert self.link_fake.created_one_time[0]["amount"] == 140  # amount + tiered fixed fee
+        assert self.links_repo.created == []
+
+    def test_create_subscription_link_success(self, client: TestClient) -> None:
+        r = client.post(
+            "/api/v1/subscriptions",
+            headers=_HDRS,
+            content=_BODY_SUBSCRIPTION,
+        )
+        assert r.status_code == 200
+        assert r.json()["service_fee"] == 40  # tiered fixed fee
+        assert len(self.subs_repo.created) >= 1
+        assert len(self.link_fake.created_subscription) == 1
+
+
+def test_list_payment_links_sorted(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+    links_repo: FakeLinksRepo,
+) -> None:
     links_repo.list_by_user_items = [
         {
             "link_id": "link-1",
@@ -704,22 +817,26 @@ def test_list_payment_links_sorted(monkeypatch: Any) -> None:
     ]
     connected_fake = FakeStripeConnectedAccountLinkService()
     platform_fake = FakeStripePlatformAccountLinkService()
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_payment_links_repository] = lambda: links_repo
-    app.dependency_overrides[deps.get_stripe_platform_account_link_service] = lambda: platform_fake
-    app.dependency_overrides[get_stripe_connected_account_link_service_optional] = lambda: connected_fake
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_payment_links_repository: links_repo,
+            deps.get_stripe_platform_account_link_service: platform_fake,
+            get_stripe_connected_account_link_service_optional: connected_fake,
+        }
+    )
 
-    client = TestClient(app)
     r = client.get("/api/v1/payment-links", headers={"Authorization": "Bearer x"})
-    app.dependency_overrides.clear()
     assert r.status_code == 200
     items = r.json()
     assert items[0]["title"] == "New"
 
 
-def test_disable_payment_link(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
-
+def test_disable_payment_link(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
     links_repo = FakeLinksRepo(
         item={
             "link_id": "link-1",
@@ -730,127 +847,88 @@ def test_disable_payment_link(monkeypatch: Any) -> None:
     )
     link_fake = FakeLinkService()
 
-    class FakeStripePlatformAccountServiceClass:
-        @staticmethod
-        def disable_platform_payment_link(link_id: str) -> None:
-            pass
-
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_payment_links_repository] = lambda: links_repo
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: FakeStripePlatformAccountServiceClass
-    app.dependency_overrides[deps.get_stripe_link_service] = lambda: link_fake
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_payment_links_repository: links_repo,
+            deps.get_stripe_platform_account_service: _FakePlatformServiceNoop,
+            deps.get_stripe_link_service: link_fake,
+        }
+    )
 
-    client = TestClient(app)
     r = client.post("/api/v1/payment-links/link-1/disable", headers={"Authorization": "Bearer x"})
-    app.dependency_overrides.clear()
     assert r.status_code == 200
     assert r.json()["status"] == "DISABLED"
     assert "link-1" in links_repo.disabled
     assert "plink_1" in link_fake.disabled
 
 
-def test_disable_subscription_link_not_found(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
-
+def test_disable_subscription_link_not_found(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
     subs_repo = FakeSubsRepo(item=None)
 
-    class FakeStripePlatformAccountServiceClass:
-        @staticmethod
-        def disable_platform_payment_link(link_id: str) -> None:
-            pass
-
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_subscriptions_repository] = lambda: subs_repo
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: FakeStripePlatformAccountServiceClass
-    app.dependency_overrides[deps.get_stripe_link_service] = lambda: FakeLinkService()
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_subscriptions_repository: subs_repo,
+            deps.get_stripe_platform_account_service: _FakePlatformServiceNoop,
+            deps.get_stripe_link_service: FakeLinkService(),
+        }
+    )
 
-    client = TestClient(app)
     r = client.post("/api/v1/subscriptions/sub-1/disable", headers={"Authorization": "Bearer x"})
-    app.dependency_overrides.clear()
     assert r.status_code == 404
 
 
-def test_create_subscription_link_success(monkeypatch: Any) -> None:
-    from payme.api import dependencies as deps
-
-    subs_repo = FakeSubsRepo()
-    link_fake = FakeLinkService(is_platform=False)
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_subscriptions_repository] = lambda: subs_repo
-    app.dependency_overrides[deps.get_stripe_link_service] = lambda: link_fake
-
-    client = TestClient(app)
-    r = client.post(
-        "/api/v1/subscriptions",
-        headers={"Authorization": "Bearer x"},
-        json={"amount": 200, "currency": "usd", "interval": "month"},
-    )
-    app.dependency_overrides.clear()
-    assert r.status_code == 200
-    assert r.json()["service_fee"] == 40  # tiered fixed fee
-    assert len(subs_repo.created) >= 1
-    assert len(link_fake.created_subscription) == 1
-
-
 # ---------------------------------------------------------------------------
 # Transfers
 # ---------------------------------------------------------------------------
 
 
-def test_create_payouts_missing_connected_account_returns_400() -> None:
-    from payme.api import dependencies as deps
-
+def test_create_payouts_missing_connected_account_returns_400(
+    client: TestClient,
+    override: Callable[[dict], None],
+) -> None:
     principal_missing_account_id = Principal(
         user_id="user-1",
         email="test@example.com",
         external_sub="sub-cognito",
         stripe_account=FakeStripeAccountRecord("user-1", "", status="VERIFIED"),
     )
+    override(
+        {
+            deps.get_resolved_principal: principal_missing_account_id,
+            deps.get_stripe_accounts_repository: FakePayoutAccountsRepo(allow_clear=False),
+        }
+    )
 
-    class FakeStripeAccountsRepo:
-        def clear_pending_earnings(self, user_id: str, only_currencies: list[str] | None = None) -> None:
-            raise AssertionError("clear_pending_earnings should not be called")
-
-    app.dependency_overrides[deps.get_resolved_principal] = lambda: principal_missing_account_id
-    app.dependency_overrides[deps.get_stripe_accounts_repository] = lambda: FakeStripeAccountsRepo()
-
-    client = TestClient(app)
     r = client.post("/api/v1/transfers/payouts", headers={"Authorization": "Bearer x"})
-    app.dependency_overrides.clear()
 
     assert r.status_code == 400
     assert "Connected Stripe account is required" in r.json()["detail"]
 
 
-def test_create_payouts_success() -> None:
-    from payme.api import dependencies as deps
-
-    class FakeStripeAccountsRepo:
-        def __init__(self) -> None:
-            self.cleared = False
-            self.user_id: str | None = None
-
-        def clear_pending_earnings(self, user_id: str, only_currencies: list[str] | None = None) -> None:
-            self.cleared = True
-            self.user_id = user_id
-
-    class FakePlatformService:
-        @staticmethod
-        def create_payouts_from_available_balance(stripe_account_id: str) -> dict[str, Any]:
-            return {
-                "transferred": {"gbp": 1000},
-                "failed": {},
-                "payout_ids": {"gbp": "po_123"},
-            }
-
-    repo = FakeStripeAccountsRepo()
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_stripe_accounts_repository] = lambda: repo
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: FakePlatformService
+def test_create_payouts_success(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
+    repo = FakePayoutAccountsRepo()
+    platform_service = FakePayoutPlatformService(
+        payout_result={"transferred": {"gbp": 1000}, "failed": {}, "payout_ids": {"gbp": "po_123"}}
+    )
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_stripe_accounts_repository: repo,
+            deps.get_stripe_platform_account_service: platform_service,
+        }
+    )
 
-    client = TestClient(app)
     r = client.post("/api/v1/transfers/payouts", headers={"Authorization": "Bearer x"})
-    app.dependency_overrides.clear()
 
     assert r.status_code == 200, r.json()
     body = r.json()
@@ -859,33 +937,24 @@ def test_create_payouts_success() -> None:
     assert body["failed"] == {}
     assert body["payout_ids"] == {"gbp": "po_123"}
     assert body["status"] == "success"
-    assert repo.cleared is True
-    assert repo.user_id == "user-1"
-
-
-def test_create_payouts_no_available_balance() -> None:
-    from payme.api import dependencies as deps
+    assert repo.cleared == [("user-1", None)]
+    assert platform_service.payout_calls == ["acct_123"]
 
-    class FakeStripeAccountsRepo:
-        def clear_pending_earnings(self, user_id: str, only_currencies: list[str] | None = None) -> None:
-            raise AssertionError("clear_pending_earnings should not be called")
-
-    class FakePlatformService:
-        @staticmethod
-        def create_payouts_from_available_balance(stripe_account_id: str) -> dict[str, Any]:
-            return {
-                "transferred": {},
-                "failed": {},
-                "payout_ids": {},
-            }
 
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_stripe_accounts_repository] = lambda: FakeStripeAccountsRepo()
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: FakePlatformService
+def test_create_payouts_no_available_balance(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_stripe_accounts_repository: FakePayoutAccountsRepo(allow_clear=False),
+            deps.get_stripe_platform_account_service: FakePayoutPlatformService(),
+        }
+    )
 
-    client = TestClient(app)
     r = client.post("/api/v1/transfers/payouts", headers={"Authorization": "Bearer x"})
-    app.dependency_overrides.clear()
 
     assert r.status_code == 200, r.json()
     body = r.json()
@@ -896,29 +965,22 @@ def test_create_payouts_no_available_balance() -> None:
     assert "No available balance in connected Stripe account" in body["message"]
 
 
-def test_create_payouts_failure_returns_502() -> None:
-    from payme.api import dependencies as deps
-
-    class FakeStripeAccountsRepo:
-        def clear_pending_earnings(self, user_id: str, only_currencies: list[str] | None = None) -> None:
-            raise AssertionError("clear_pending_earnings should not be called")
-
-    class FakePlatformService:
-        @staticmethod
-        def create_payouts_from_available_balance(stripe_account_id: str) -> dict[str, Any]:
-            return {
-                "transferred": {},
-                "failed": {"gbp": "payout failed"},
-                "payout_ids": {},
-            }
-
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_stripe_accounts_repository] = lambda: FakeStripeAccountsRepo()
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: FakePlatformService
+def test_create_payouts_failure_returns_502(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_stripe_accounts_repository: FakePayoutAccountsRepo(allow_clear=False),
+            deps.get_stripe_platform_account_service: FakePayoutPlatformService(
+                payout_result={"transferred": {}, "failed": {"gbp": "payout failed"}, "payout_ids": {}}
+            ),
+        }
+    )
 
-    client = TestClient(app)
     r = client.post("/api/v1/transfers/payouts", headers={"Authorization": "Bearer x"})
-    app.dependency_overrides.clear()
 
     assert r.status_code == 502
     body = r.json()["detail"]
@@ -926,65 +988,55 @@ def test_create_payouts_failure_returns_502() -> None:
     assert "gbp" in body["failed"]
 
 
-def test_create_payout_schedule_success_weekly() -> None:
-    from payme.api import dependencies as deps
+def test_create_payout_schedule_success_weekly(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
+    platform_service = FakePayoutPlatformService(schedule={"interval": "weekly", "weekly_anchor": "monday"})
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_stripe_platform_account_service: platform_service,
+        }
+    )
 
-    class FakePlatformService:
-        @staticmethod
-        def update_payout_schedule(
-            stripe_account_id: str,
-            interval: str,
-            weekly_anchor: str | None = None,
-            monthly_anchor: int | None = None,
-        ) -> dict[str, Any]:
-            assert stripe_account_id == "acct_123"
-            assert interval == "weekly"
-            assert weekly_anchor == "monday"
-            assert monthly_anchor is None
-            return {"interval": "weekly", "weekly_anchor": "monday"}
-
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: FakePlatformService
-
-    client = TestClient(app)
     r = client.post(
         "/api/v1/transfers/schedules",
         headers={"Authorization": "Bearer x"},
         json={"interval": "weekly", "weekly_anchor": "monday"},
     )
-    app.dependency_overrides.clear()
 
     assert r.status_code == 200, r.json()
     body = r.json()
     assert body["stripe_account_id"] == "acct_123"
     assert body["schedule"] == {"interval": "weekly", "weekly_anchor": "monday"}
+    assert platform_service.schedule_calls == [
+        {"stripe_account_id": "acct_123", "interval": "weekly", "weekly_anchor": "monday", "monthly_anchor": None}
+    ]
 
 
-def test_create_payout_schedule_requires_anchor_for_weekly() -> None:
-    from payme.api import dependencies as deps
+def test_create_payout_schedule_requires_anchor_for_weekly(
+    client: TestClient,
+    principal_with_account: Principal,
+    override: Callable[[dict], None],
+) -> None:
+    platform_service = FakePayoutPlatformService()
+    override(
+        {
+            deps.get_resolved_principal: principal_with_account,
+            deps.get_stripe_platform_account_service: platform_service,
+        }
+    )
 
-    class FakePlatformService:
-        @staticmethod
-        def update_payout_schedule(
-            stripe_account_id: str,
-            interval: str,
-            weekly_anchor: str | None = None,
-            monthly_anchor: int | None = None,
-        ) -> dict[str, Any]:
-            return {"interval": interval}
-
-    app.dependency_overrides[deps.get_resolved_principal] = override_get_resolved_principal
-    app.dependency_overrides[deps.get_stripe_platform_account_service] = lambda: FakePlatformService
-
-    client = TestClient(app)
     r = client.post(
         "/api/v1/transfers/schedules",
         headers={"Authorization": "Bearer x"},
         json={"interval": "weekly"},
     )
-    app.dependency_overrides.clear()
 
     assert r.status_code == 422
+    assert platform_service.schedule_calls == []
 
 
 # ---------------------------------------------------------------------------
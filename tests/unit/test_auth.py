@@ -1,7 +1,13 @@
 import time
 
 import payme.core.auth as auth_module
-from payme.core.auth import CognitoJwksCache, Principal, _get_signing_key, resolve_principal
+from payme.core.auth import (
+    CognitoJwksCache,
+    Principal,
+    TokenClaimsCache,
+    _get_signing_key,
+    resolve_principal,
+)
 from payme.db.repositories import UserRecord
 
 
@@ -126,13 +132,15 @@ def test_jwks_cache_fetches(monkeypatch):
     cache = CognitoJwksCache()
     jwks = cache.get()
 
-    assert jwks["keys"][0]["kid"] == "kid-1"
+    assert jwks["raw"]["keys"][0]["kid"] == "kid-1"
+    assert jwks["by_kid"] == {"kid-1": {"kid": "kid-1"}}
     assert cache._expires_at > time.time()
+    assert cache.version == 1
 
 
 def test_get_signing_key_found(monkeypatch):
     monkeypatch.setattr(auth_module.jwt, "get_unverified_header", lambda token: {"kid": "kid-1"})
-    monkeypatch.setattr(auth_module._jwks_cache, "get", lambda: {"keys": [{"kid": "kid-1", "kty": "RSA"}]})
+    monkeypatch.setattr(auth_module._jwks_cache, "get", lambda: {"by_kid": {"kid-1": {"kid": "kid-1", "kty": "RSA"}}})
 
     key = _get_signing_key("token")
     assert key["kid"] == "kid-1"
@@ -140,7 +148,7 @@ def test_get_signing_key_found(monkeypatch):
 
 def test_get_signing_key_missing(monkeypatch):
     monkeypatch.setattr(auth_module.jwt, "get_unverified_header", lambda token: {"kid": "kid-2"})
-    monkeypatch.setattr(auth_module._jwks_cache, "get", lambda: {"keys": [{"kid": "kid-1"}]})
+    monkeypatch.setattr(auth_module._jwks_cache, "get", lambda: {"by_kid": {"kid-1": {"kid": "kid-1"}}})
 
     try:
         _get_signing_key("token")
@@ -148,3 +156,34 @@ def test_get_signing_key_missing(monkeypatch):
         assert exc.status_code == 401
     else:
         raise AssertionError("Expected HTTPException")
+
+
+def test_decode_token_caches_verified_claims(monkeypatch):
+    calls = []
+
+    def fake_verify(token):
+        calls.append(token)
+        return {"sub": "sub-123", "exp": time.time() + 3600}
+
+    monkeypatch.setattr(auth_module, "_verify_token", fake_verify)
+    monkeypatch.setattr(auth_module, "_claims_cache", TokenClaimsCache())
+
+    first = auth_module._decode_token("token-a")
+    second = auth_module._decode_token("token-a")
+    auth_module._decode_token("token-b")
+
+    assert first == second
+    assert calls == ["token-a", "token-b"]
+
+
+def test_claims_cache_respects_token_exp_and_jwks_refresh(monkeypatch):
+    cache = TokenClaimsCache(ttl=60)
+
+    cache.put("expired", {"sub": "sub-1", "exp": time.time() - 1})
+    assert cache.get("expired") is None
+
+    cache.put("fresh", {"sub": "sub-2", "exp": time.time() + 3600})
+    assert cache.get("fresh")["sub"] == "sub-2"
+
+    monkeypatch.setattr(auth_module._jwks_cache, "version", auth_module._jwks_cache.version + 1)
+    assert cache.get("fresh") is None
@@ -1,4 +1,9 @@
+from types import SimpleNamespace
+
+import pytest
+
 import payme.handlers.expire_links as expire_links_module
+from payme.db.repositories import ExpireCandidate
 
 
 class FakeStripeService:
@@ -24,67 +29,138 @@ class FakeUserAccountsRepo:
         self.stripe_account_id = stripe_account_id
 
     def get_primary_for_user(self, user_id: str):
-        from types import SimpleNamespace
         return SimpleNamespace(stripe_account_id=self.stripe_account_id)
 
 
 class FakeLinksRepo:
-    def __init__(self, items):
-        self._items = items
+    def __init__(self, items=()):
+        self.items = list(items)
         self.expired = []
 
     def list_expired_candidates(self, now_ts):
-        return list(self._items)
+        return list(self.items)
 
     def mark_expired(self, link_id):
         self.expired.append(link_id)
 
 
 class FakeSubsRepo:
-    def __init__(self, items):
-        self._items = items
+    def __init__(self, items=()):
+        self.items = list(items)
         self.expired = []
 
     def list_expired_candidates(self, now_ts):
-        return list(self._items)
+        return list(self.items)
 
     def mark_expired(self, subscription_id):
         self.expired.append(subscription_id)
 
 
-def test_expire_links_handler(monkeypatch):
-    account_stripe_svc = FakeStripeService()
-    platform_fake = FakeStripePlatformService()
-    accounts_repo = FakeUserAccountsRepo(stripe_account_id="acct_test")
-    links_repo = FakeLinksRepo([
-        {"link_id": "link-1", "user_id": "user-1", "stripe_payment_link_id": "plink_1", "on_platform": False},
-        {"link_id": "link-2", "user_id": "user-2", "stripe_payment_link_id": "plink_platform", "on_platform": True},
-    ])
-    subs_repo = FakeSubsRepo([
-        {"subscription_id": "sub-1", "user_id": "user-1", "stripe_payment_link_id": "plink_2", "on_platform": False},
-    ])
-
-    def fake_disable_platform(link_id: str) -> None:
-        platform_fake.disable_payment_link(link_id)
+@pytest.fixture
+def wired_expire_module(monkeypatch):
+    """Patch the handler module's services and repositories with fakes; tests fill the repos' items."""
+    fakes = SimpleNamespace(
+        account_stripe_svc=FakeStripeService(),
+        platform_fake=FakeStripePlatformService(),
+        accounts_repo=FakeUserAccountsRepo(stripe_account_id="acct_test"),
+        links_repo=FakeLinksRepo(),
+        subs_repo=FakeSubsRepo(),
+    )
 
     class FakeStripePlatformAccountServiceClass:
-        disable_platform_payment_link = staticmethod(fake_disable_platform)
+        disable_platform_payment_link = staticmethod(fakes.platform_fake.disable_payment_link)
 
     class FakeStripeConnectedAccountLinkServiceClass:
         @classmethod
         def from_account_id(cls, stripe_account_id: str):
-            return account_stripe_svc
+            return fakes.account_stripe_svc
 
     monkeypatch.setattr(expire_links_module, "StripePlatformAccountService", FakeStripePlatformAccountServiceClass)
     monkeypatch.setattr(expire_links_module, "StripeConnectedAccountLinkService", FakeStripeConnectedAccountLinkServiceClass)
-    monkeypatch.setattr(expire_links_module, "StripeAccountRepository", lambda: accounts_repo)
-    monkeypatch.setattr(expire_links_module, "PaymentLinksRepository", lambda: links_repo)
-    monkeypatch.setattr(expire_links_module, "SubscriptionsRepository", lambda: subs_repo)
+    monkeypatch.setattr(expire_links_module, "StripeAccountRepository", lambda: fakes.accounts_repo)
+    monkeypatch.setattr(expire_links_module, "PaymentLinksRepository", lambda: fakes.links_repo)
+    monkeypatch.setattr(expire_links_module, "SubscriptionsRepository", lambda: fakes.subs_repo)
+    return fakes
+
+
+@pytest.mark.parametrize(
+    "links, subs, expected",
+    [
+        pytest.param(
+            [
+                ExpireCandidate("link-1", "user-1", "plink_1", on_platform=False),
+                ExpireCandidate("link-2", "user-2", "plink_platform", on_platform=True),
+            ],
+            [
+                ExpireCandidate("sub-1", "user-1", "plink_2", on_platform=False),
+            ],
+            {
+                "result": {"expired_links": 2, "expired_subscriptions": 1},
+                "links_expired": ["link-1", "link-2"],
+                "subs_expired": ["sub-1"],
+                "account_disabled": ["plink_1", "plink_2"],
+                "platform_disabled": ["plink_platform"],
+            },
+            id="mixed_connected_and_platform",
+        ),
+        pytest.param(
+            [],
+            [
+                ExpireCandidate("sub-9", "user-9", "plink_9", on_platform=True),
+            ],
+            {
+                "result": {"expired_links": 0, "expired_subscriptions": 1},
+                "links_expired": [],
+                "subs_expired": ["sub-9"],
+                "account_disabled": [],
+                "platform_disabled": ["plink_9"],
+            },
+            id="platform_subscription_only",
+        ),
+        pytest.param(
+            [],
+            [],
+            {
+                "result": {"expired_links": 0, "expired_subscriptions": 0},
+                "links_expired": [],
+                "subs_expired": [],
+                "account_disabled": [],
+                "platform_disabled": [],
+            },
+            id="nothing_to_expire",
+        ),
+    ],
+)
+def test_expire_links_handler(wired_expire_module, links, subs, expected):
+    wired_expire_module.links_repo.items = links
+    wired_expire_module.subs_repo.items = subs
 
     result = expire_links_module.handler({}, None)
 
-    assert result == {"expired_links": 2, "expired_subscriptions": 1}
-    assert links_repo.expired == ["link-1", "link-2"]
-    assert subs_repo.expired == ["sub-1"]
-    assert account_stripe_svc.disabled == ["plink_1", "plink_2"]
-    assert platform_fake.disabled == ["plink_platform"]
+    assert result == expected["result"]
+    assert wired_expire_module.links_repo.expired == expected["links_expired"]
+    assert wired_expire_module.subs_repo.expired == expected["subs_expired"]
+    # The Stripe fakes are appended to from worker threads, so their order is not fixed.
+    assert sorted(wired_expire_module.account_stripe_svc.disabled) == expected["account_disabled"]
+    assert sorted(wired_expire_module.platform_fake.disabled) == expected["platform_disabled"]
+
+
+def test_expire_links_handler_marks_each_link_independently(wired_expire_module, monkeypatch):
+    links_repo = wired_expire_module.links_repo
+    links_repo.items = [
+        ExpireCandidate("link-1", "user-1", "plink_1", on_platform=True),
+        ExpireCandidate("link-2", "user-1", "plink_2", on_platform=True),
+    ]
+    record_expired = links_repo.mark_expired
+
+    def mark_expired(link_id):
+        if link_id == "link-1":
+            raise RuntimeError("conditional check failed")
+        record_expired(link_id)
+
+    monkeypatch.setattr(links_repo, "mark_expired", mark_expired)
+
+    expire_links_module.handler({}, None)
+
+    assert sorted(wired_expire_module.platform_fake.disabled) == ["plink_1", "plink_2"]
+    assert links_repo.expired == ["link-2"]
@@ -1,3 +1,5 @@
+import pytest
+
 from payme.services.fees import (
     amount_with_fee,
     amount_with_subscription_fee,
@@ -29,6 +31,13 @@ def test_amount_with_fee_stripe_percent():
     assert service_fee_cents == 40
 
 
+def test_amount_with_fee_rounds_half_up():
+    # amount=1002 => fee=80; total = 1082 / (1 - 0.20) = 1352.5 -> 1353
+    total, _, _, service_fee_cents = amount_with_fee(1002, currency="usd", stripe_fee_percent=20.0)
+    assert total == 1353
+    assert service_fee_cents == 80
+
+
 def test_amount_with_subscription_fee():
     total, service_fee_percent, stripe_fee_percent = amount_with_subscription_fee(
         500, currency="usd", stripe_fee_percent=0.0
@@ -39,6 +48,16 @@ def test_amount_with_subscription_fee():
     assert stripe_fee_percent == 0.0
 
 
+@pytest.mark.parametrize(
+    "amount, expected_fee",
+    [(0, 40), (1000, 40), (1001, 80), (2000, 80), (100000, 2000), (1000000, 6000), (1000001, 10000)],
+)
+def test_amount_with_fee_tier_boundaries(amount, expected_fee):
+    # Tier thresholds are inclusive upper bounds; anything above the last one uses the final tier.
+    *_, service_fee_cents = amount_with_fee(amount, stripe_fee_percent=0.0)
+    assert service_fee_cents == expected_fee
+
+
 def test_subtract_fees():
     assert subtract_fees(100, 55) == 45
     assert subtract_fees(40, 55) == 0
@@ -65,6 +84,11 @@ def test_amount_with_fee_rejects_percent_ge_100():
         assert False, "Expected ValueError"
 
 
+def test_earnings_from_payment_rejects_percent_ge_100():
+    with pytest.raises(ValueError, match="100"):
+        earnings_from_payment(1000, service_fee_percent=60, stripe_fee_percent=40)
+
+
 def test_subtract_fees_rejects_negative_amount():
     try:
         subtract_fees(-1, 1)
@@ -6,11 +6,61 @@ stripe_accounts table (DynamoDB).
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from types import MappingProxyType, SimpleNamespace
+from typing import NamedTuple
+from unittest.mock import MagicMock
+
+import pytest
+
+import payme.services.stripe_event_handler as event_handler_module
+from payme.db.repositories import (
+    PaymentLinksRepository,
+    StripeAccountRepository,
+    SubscriptionsRepository,
+    TransactionsRepository,
+)
 from payme.services.stripe_event_handler import (
     handle_invoice_paid,
     handle_payment_succeeded,
 )
+from payme.services.stripe_subscriptions_service import StripeSubscriptionsService
+
+
+@pytest.fixture
+def event_handler_mocks(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """
+    Spec'd mocks for the repositories/services the handler constructs. Each repository class in the
+    handler module is replaced by a factory returning the same mock, so tests assert on one instance.
+    """
+    mocks = SimpleNamespace(
+        account_repo=MagicMock(spec=StripeAccountRepository),
+        links_repo=MagicMock(spec=PaymentLinksRepository),
+        subs_repo=MagicMock(spec=SubscriptionsRepository),
+        tx_repo=MagicMock(spec=TransactionsRepository),
+        subs_service=MagicMock(spec=StripeSubscriptionsService),
+    )
+    mocks.tx_repo.get_by_payment_intent_id.return_value = None
+    for name, instance in (
+        ("StripeAccountRepository", mocks.account_repo),
+        ("PaymentLinksRepository", mocks.links_repo),
+        ("SubscriptionsRepository", mocks.subs_repo),
+        ("TransactionsRepository", mocks.tx_repo),
+    ):
+        monkeypatch.setattr(event_handler_module, name, MagicMock(return_value=instance))
+    monkeypatch.setattr(event_handler_module, "StripeSubscriptionsService", mocks.subs_service)
+    return mocks
+
+
+# Read-only payload parts shared by every event; builders overlay per-test fields onto a fresh dict,
+# so the handler (which checks isinstance(..., dict)) still receives plain dicts.
+_PAYMENT_INTENT_OBJECT = MappingProxyType({"created": 1700000000})
+_INVOICE_OBJECT = MappingProxyType(
+    {
+        "created": 1700000000,
+        "customer_email": "customer@example.com",
+        "subscription": "sub_stripe_1",
+    }
+)
 
 
 def _payment_intent_succeeded_event(
@@ -27,11 +77,11 @@ def _payment_intent_succeeded_event(
         base_amount = amount
     return {
         "object": {
+            **_PAYMENT_INTENT_OBJECT,
             "id": payment_intent_id,
             "amount_received": amount,
             "amount": amount,
             "currency": currency,
-            "created": 1700000000,
             "metadata": {
                 "user_id": user_id,
                 "link_id": link_id,
@@ -57,13 +107,11 @@ def _invoice_paid_event(
         base_amount = amount
     return {
         "object": {
+            **_INVOICE_OBJECT,
             "id": invoice_id,
             "amount_paid": amount,
             "currency": currency,
-            "created": 1700000000,
-            "customer_email": "customer@example.com",
             "payment_intent": {"id": payment_intent_id} if payment_intent_id else None,
-            "subscription": "sub_stripe_1",
             "lines": {
                 "data": [
                     {"metadata": {"user_id": user_id, "link_id": link_id, "base_amount": str(base_amount)}},
@@ -73,153 +121,121 @@ def _invoice_paid_event(
     }
 
 
-@patch("payme.services.stripe_event_handler.StripeAccountRepository")
-@patch("payme.services.stripe_event_handler.PaymentLinksRepository")
-@patch("payme.services.stripe_event_handler.TransactionsRepository")
-def test_handle_payment_succeeded_updates_payment_link_and_stripe_account_earnings(
-    mock_tx_repo_cls: MagicMock,
-    mock_links_repo_cls: MagicMock,
-    mock_account_repo_cls: MagicMock,
-) -> None:
-    """Payment intent succeeded: earnings added to payment link and to stripe_accounts (DynamoDB)."""
-    mock_links_repo = MagicMock()
-    mock_links_repo_cls.return_value = mock_links_repo
-
-    mock_tx_repo = MagicMock()
-    mock_tx_repo.get_by_payment_intent_id.return_value = None
-    mock_tx_repo_cls.return_value = mock_tx_repo
-
-    data = _payment_intent_succeeded_event(user_id="u1", link_id="link-1", amount=1000, currency="gbp")
-    result = handle_payment_succeeded("payment_intent.succeeded", data, account_id=None)
-
-    assert result is True
-    mock_links_repo.add_payment_result.assert_called_once()
-    call_args = mock_links_repo.add_payment_result.call_args[0]
-    assert call_args[0] == "link-1"
-    earnings = call_args[1]
-    total_amount = call_args[2]
-    assert total_amount == 1000
-    assert earnings == 1000
-
-    mock_account_repo_cls.return_value.add_earnings.assert_called_once()
-    acc_call = mock_account_repo_cls.return_value.add_earnings.call_args[0]
-    assert acc_call[0] == "u1"
-    assert acc_call[1] == earnings
-    assert acc_call[2] == "gbp"
-
-
-@patch("payme.services.stripe_event_handler.StripeAccountRepository")
-@patch("payme.services.stripe_event_handler.PaymentLinksRepository")
-@patch("payme.services.stripe_event_handler.TransactionsRepository")
-def test_handle_payment_succeeded_connect_account_still_updates_earnings(
-    mock_tx_repo_cls: MagicMock,
-    mock_links_repo_cls: MagicMock,
-    mock_account_repo_cls: MagicMock,
-) -> None:
-    """With connected account (account_id set), earnings still added to link and stripe_accounts."""
-    mock_links_repo = MagicMock()
-    mock_links_repo.get.return_value = {"link_id": "link-2", "service_fee": 0}
-    mock_links_repo_cls.return_value = mock_links_repo
-
-    mock_tx_repo = MagicMock()
-    mock_tx_repo.get_by_payment_intent_id.return_value = None
-    mock_tx_repo_cls.return_value = mock_tx_repo
-
-    data = _payment_intent_succeeded_event(
-        user_id="u2", link_id="link-2", amount=5000, currency="usd", base_amount=5000, account_type="connected_account"
-    )
-    result = handle_payment_succeeded("payment_intent.succeeded", data, account_id="acct_connected")
-
-    assert result is True
-    mock_links_repo.add_payment_result.assert_called_once()
-    call_args = mock_links_repo.add_payment_result.call_args[0]
-    assert call_args[0] == "link-2"
-    assert call_args[2] == 5000
-    earnings = call_args[1]
-    assert earnings == 5000
-    mock_account_repo_cls.return_value.add_pending_earnings.assert_called_once_with("u2", earnings, "usd")
-
-    mock_account_repo_cls.return_value.add_earnings.assert_called_once()
-    acc_call = mock_account_repo_cls.return_value.add_earnings.call_args[0]
-    assert acc_call[0] == "u2"
-    assert acc_call[1] == earnings
-    assert acc_call[2] == "usd"
-
-
-@patch("payme.services.stripe_event_handler.StripeAccountRepository")
-@patch("payme.services.stripe_event_handler.SubscriptionsRepository")
-@patch("payme.services.stripe_event_handler.TransactionsRepository")
-@patch("payme.services.stripe_event_handler.StripeSubscriptionsService")
-def test_handle_invoice_paid_updates_subscription_link_and_stripe_account_earnings(
-    mock_stripe_subs_service: MagicMock,
-    mock_tx_repo_cls: MagicMock,
-    mock_subs_repo_cls: MagicMock,
-    mock_account_repo_cls: MagicMock,
-) -> None:
-    """Invoice paid: earnings added to subscription link and to stripe_accounts (DynamoDB)."""
-    mock_subs_repo = MagicMock()
-    mock_subs_repo_cls.return_value = mock_subs_repo
-
-    mock_tx_repo = MagicMock()
-    mock_tx_repo.get_by_payment_intent_id.return_value = None
-    mock_tx_repo_cls.return_value = mock_tx_repo
-
-    data = _invoice_paid_event(user_id="u3", link_id="sub-1", amount=3000, currency="gbp")
-    data["object"]["billing_reason"] = "subscription_create"
-    result = handle_invoice_paid(data, account_id=None)
-
-    assert result is True
-    mock_stripe_subs_service.upsert_from_invoice_paid.assert_called_once()
-    mock_subs_repo.add_payment_result.assert_called_once()
-    call_args = mock_subs_repo.add_payment_result.call_args[0]
-    assert call_args[0] == "sub-1"
-    earnings = call_args[1]
-    total_amount = call_args[2]
-    assert total_amount == 3000
-    assert earnings == 3000
-
-    mock_account_repo_cls.return_value.add_earnings.assert_called_once()
-    acc_call = mock_account_repo_cls.return_value.add_earnings.call_args[0]
-    assert acc_call[0] == "u3"
-    assert acc_call[1] == earnings
-    assert acc_call[2] == "gbp"
-
-
-@patch("payme.services.stripe_event_handler.StripeAccountRepository")
-@patch("payme.services.stripe_event_handler.SubscriptionsRepository")
-@patch("payme.services.stripe_event_handler.TransactionsRepository")
-@patch("payme.services.stripe_event_handler.StripeSubscriptionsService")
-def test_handle_invoice_paid_zero_earnings_does_not_call_add_earnings(
-    mock_stripe_subs_service: MagicMock,
-    mock_tx_repo_cls: MagicMock,
-    mock_subs_repo_cls: MagicMock,
-    mock_account_repo_cls: MagicMock,
+class _SuccessCase(NamedTuple):
+    """One success-path webhook: how to build and dispatch it, and what the handler should record."""
+
+    event: str
+    event_kwargs: dict
+    account_id: str | None
+    link_repo: str
+    link_id: str
+    user_id: str
+    amount: int
+    earnings: int
+    currency: str
+
+
+_SUCCESS_CASES = [
+    # Payment intent succeeded: earnings added to payment link and to stripe_accounts (DynamoDB).
+    pytest.param(
+        _SuccessCase(
+            event="payment_intent",
+            event_kwargs={"user_id": "u1", "link_id": "link-1", "amount": 1000, "currency": "gbp"},
+            account_id=None,
+            link_repo="links_repo",
+            link_id="link-1",
+            user_id="u1",
+            amount=1000,
+            earnings=1000,
+            currency="gbp",
+        ),
+        id="payment_intent",
+    ),
+    # With connected account (account_id set), earnings still added to link and stripe_accounts.
+    pytest.param(
+        _SuccessCase(
+            event="payment_intent",
+            event_kwargs={
+                "user_id": "u2",
+                "link_id": "link-2",
+                "amount": 5000,
+                "currency": "usd",
+                "base_amount": 5000,
+                "account_type": "connected_account",
+            },
+            account_id="acct_connected",
+            link_repo="links_repo",
+            link_id="link-2",
+            user_id="u2",
+            amount=5000,
+            earnings=5000,
+            currency="usd",
+        ),
+        id="payment_intent_connected_account",
+    ),
+    # Invoice paid: earnings added to subscription link and to stripe_accounts (DynamoDB).
+    pytest.param(
+        _SuccessCase(
+            event="invoice",
+            event_kwargs={"user_id": "u3", "link_id": "sub-1", "amount": 3000, "currency": "gbp"},
+            account_id=None,
+            link_repo="subs_repo",
+            link_id="sub-1",
+            user_id="u3",
+            amount=3000,
+            earnings=3000,
+            currency="gbp",
+        ),
+        id="invoice_paid",
+    ),
+    # When earnings are 0 (e.g. full fee), add_earnings is not called on stripe account.
+    pytest.param(
+        _SuccessCase(
+            event="invoice",
+            event_kwargs={"user_id": "u4", "link_id": "sub-1", "amount": 500, "currency": "usd", "base_amount": 0},
+            account_id=None,
+            link_repo="subs_repo",
+            link_id="sub-1",
+            user_id="u4",
+            amount=500,
+            earnings=0,
+            currency="usd",
+        ),
+        id="invoice_paid_zero_earnings",
+    ),
+]
+
+
+@pytest.mark.parametrize("case", _SUCCESS_CASES)
+def test_handler_success_updates_link_and_stripe_account_earnings(
+    case: _SuccessCase,
+    event_handler_mocks: SimpleNamespace,
 ) -> None:
-    """When earnings are 0 (e.g. full fee), add_earnings is not called on stripe account."""
-    mock_subs_repo = MagicMock()
-    mock_subs_repo_cls.return_value = mock_subs_repo
-
-    mock_tx_repo = MagicMock()
-    mock_tx_repo.get_by_payment_intent_id.return_value = None
-    mock_tx_repo_cls.return_value = mock_tx_repo
-
-    data = _invoice_paid_event(user_id="u4", link_id="sub-1", amount=500, currency="usd", base_amount=0)
-    data["object"]["billing_reason"] = "subscription_create"
-    result = handle_invoice_paid(data, account_id=None)
+    """Successful payment/invoice events record the payment on the link and earnings on stripe_accounts."""
+    link_repo = getattr(event_handler_mocks, case.link_repo)
+    account_repo = event_handler_mocks.account_repo
+
+    if case.event == "payment_intent":
+        data = _payment_intent_succeeded_event(**case.event_kwargs)
+        result = handle_payment_succeeded("payment_intent.succeeded", data, account_id=case.account_id)
+    else:
+        data = _invoice_paid_event(**case.event_kwargs)
+        data["object"]["billing_reason"] = "subscription_create"
+        result = handle_invoice_paid(data, account_id=case.account_id)
 
     assert result is True
-    mock_stripe_subs_service.upsert_from_invoice_paid.assert_called_once()
-    mock_subs_repo.add_payment_result.assert_called_once()
-    mock_account_repo_cls.return_value.add_earnings.assert_not_called()
+    if case.event == "invoice":
+        event_handler_mocks.subs_service.upsert_from_invoice_paid.assert_called_once()
+    link_repo.add_payment_result.assert_called_once_with(case.link_id, case.earnings, case.amount)
+    account_repo.add_pending_earnings.assert_called_once_with(case.user_id, case.earnings, case.currency)
+    if case.earnings > 0:
+        account_repo.add_earnings.assert_called_once_with(case.user_id, case.earnings, case.currency)
+    else:
+        account_repo.add_earnings.assert_not_called()
 
 
-@patch("payme.services.stripe_event_handler.StripeAccountRepository")
-@patch("payme.services.stripe_event_handler.PaymentLinksRepository")
-@patch("payme.services.stripe_event_handler.TransactionsRepository")
 def test_handle_payment_succeeded_missing_metadata_returns_false(
-    mock_tx_repo_cls: MagicMock,
-    mock_links_repo_cls: MagicMock,
-    mock_account_repo_cls: MagicMock,
+    event_handler_mocks: SimpleNamespace,
 ) -> None:
     """When metadata lacks user_id/link_id, handler returns False and does not update earnings."""
     data = {
@@ -233,5 +249,5 @@ def test_handle_payment_succeeded_missing_metadata_returns_false(
     result = handle_payment_succeeded("payment_intent.succeeded", data)
 
     assert result is False
-    mock_links_repo_cls.return_value.add_payment_result.assert_not_called()
-    mock_account_repo_cls.return_value.add_earnings.assert_not_called()
+    event_handler_mocks.links_repo.add_payment_result.assert_not_called()
+    event_handler_mocks.account_repo.add_earnings.assert_not_called()
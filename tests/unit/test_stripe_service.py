@@ -3,9 +3,13 @@
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+import pytest
+import stripe
+
 import payme.services.stripe_platform_account_service as platform_module
 import payme.services.payment_links.connected_link_service as link_module
 import payme.services.stripe_subscriptions_service as subscriptions_module
+from payme.core.auth import Principal
 from payme.core.constants import StripeAccountStatus
 from payme.db.repositories import StripeAccountRecord
 from payme.services.payment_links import StripeConnectedAccountLinkService
@@ -16,8 +20,44 @@ _TEST_ACCOUNT_ID = "acct_123"
 _TEST_USER_ID = "user-1"
 
 
-def _test_principal():
-    from payme.core.auth import Principal
+def _unexpected_stripe_call(*args, **kwargs):
+    raise AssertionError("unexpected Stripe API call")
+
+
+def _stripe_resource(*methods: str) -> SimpleNamespace:
+    return SimpleNamespace(**{name: _unexpected_stripe_call for name in methods})
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stripe_stub():
+    """
+    Replace the ``stripe`` module seen by the services under test with a plain namespace for this module.
+    Every API method fails loudly unless a test sets it, so nothing can reach the network, and
+    per-test monkeypatch.setattr on the namespace is undone after each test.
+    """
+    stub = SimpleNamespace(
+        api_key=None,
+        StripeError=stripe.StripeError,
+        InvalidRequestError=stripe.InvalidRequestError,
+        Account=_stripe_resource("create", "retrieve", "modify", "delete"),
+        AccountLink=_stripe_resource("create"),
+        Balance=_stripe_resource("retrieve"),
+        PaymentIntent=_stripe_resource("search"),
+        PaymentLink=_stripe_resource("create", "modify"),
+        Payout=_stripe_resource("create"),
+        Subscription=_stripe_resource("cancel"),
+        Transfer=_stripe_resource("create"),
+    )
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(platform_module, "stripe", stub)
+        mp.setattr(link_module, "stripe", stub)
+        mp.setattr(subscriptions_module, "stripe", stub)
+        yield stub
+
+
+@pytest.fixture(scope="module")
+def principal() -> Principal:
+    # Principal and StripeAccountRecord are frozen, so one instance serves the whole module.
     return Principal(
         user_id=_TEST_USER_ID,
         email="test@example.com",
@@ -33,7 +73,6 @@ def _test_principal():
 
 
 def test_from_account_id_requires_valid_account_id():
-    import pytest
     with pytest.raises(ValueError, match="stripe_account_id"):
         StripeConnectedAccountLinkService.from_account_id("")
     with pytest.raises(ValueError, match="acct_"):
@@ -47,7 +86,7 @@ def test_platform_create_connected_account(monkeypatch):
         captured.update(kwargs)
         return SimpleNamespace(id="acct_1")
 
-    monkeypatch.setattr(platform_module.stripe.Account, "create", staticmethod(fake_create))
+    monkeypatch.setattr(platform_module.stripe.Account, "create", fake_create)
 
     account_id = StripePlatformAccountService.create_custom_connected_account(email="test@example.com", country="GB")
 
@@ -61,25 +100,21 @@ def test_platform_get_account_status(monkeypatch):
     monkeypatch.setattr(
         platform_module.stripe.Account,
         "retrieve",
-        staticmethod(
-            lambda id=None, **kwargs: {
-                "charges_enabled": True,
-                "payouts_enabled": False,
-                "details_submitted": True,
-                "requirements": {"currently_due": []},
-                "capabilities": {"transfers": "active"},
-            }
-        ),
+        lambda id=None, **kwargs: {
+            "charges_enabled": True,
+            "payouts_enabled": False,
+            "details_submitted": True,
+            "requirements": {"currently_due": []},
+            "capabilities": {"transfers": "active"},
+        },
     )
     monkeypatch.setattr(
         platform_module.stripe.Balance,
         "retrieve",
-        staticmethod(
-            lambda stripe_account: {
-                "pending": [{"amount": 100, "currency": "gbp"}],
-                "available": [{"amount": 50, "currency": "gbp"}],
-            }
-        ),
+        lambda stripe_account: {
+            "pending": [{"amount": 100, "currency": "gbp"}],
+            "available": [{"amount": 50, "currency": "gbp"}],
+        },
     )
 
     status = StripePlatformAccountService.get_account_status(_TEST_ACCOUNT_ID)
@@ -96,14 +131,14 @@ def test_platform_create_account_link_uses_stripe(monkeypatch):
     def fake_create(**kwargs):
         return SimpleNamespace(url="https://stripe.example.com/onboard")
 
-    monkeypatch.setattr(platform_module.stripe.AccountLink, "create", staticmethod(fake_create))
+    monkeypatch.setattr(platform_module.stripe.AccountLink, "create", fake_create)
 
     url = StripePlatformAccountService.create_account_link(_TEST_ACCOUNT_ID)
 
     assert url == "https://stripe.example.com/onboard"
 
 
-def test_connected_account_create_payment_link_one_time_with_fee(monkeypatch):
+def test_connected_account_create_payment_link_one_time_with_fee(monkeypatch, principal):
     captured = {}
 
     def fake_create(**kwargs):
@@ -112,7 +147,7 @@ def test_connected_account_create_payment_link_one_time_with_fee(monkeypatch):
 
     monkeypatch.setattr(link_module.stripe.PaymentLink, "create", fake_create)
 
-    service = StripeConnectedAccountLinkService(_test_principal())
+    service = StripeConnectedAccountLinkService(principal)
     service.create_payment_link_one_time(
         link_id="link-1",
         title="Pay",
@@ -136,7 +171,7 @@ def test_platform_create_transfer(monkeypatch):
         captured.update(kwargs)
         return SimpleNamespace(id="tr_1")
 
-    monkeypatch.setattr(platform_module.stripe.Transfer, "create", staticmethod(fake_create))
+    monkeypatch.setattr(platform_module.stripe.Transfer, "create", fake_create)
 
     transfer_id = StripePlatformAccountService.create_transfer(
         amount=1050,
@@ -157,7 +192,7 @@ def test_platform_create_payout(monkeypatch):
         captured.update(kwargs)
         return SimpleNamespace(id="po_1")
 
-    monkeypatch.setattr(platform_module.stripe.Payout, "create", staticmethod(fake_create))
+    monkeypatch.setattr(platform_module.stripe.Payout, "create", fake_create)
 
     payout_id = StripePlatformAccountService.create_payout(
         amount=900,
@@ -175,14 +210,12 @@ def test_platform_create_payouts_from_available_balance(monkeypatch):
     monkeypatch.setattr(
         platform_module.stripe.Balance,
         "retrieve",
-        staticmethod(
-            lambda stripe_account: {
-                "available": [
-                    {"amount": 1100, "currency": "gbp"},
-                    {"amount": 500, "currency": "usd"},
-                ]
-            }
-        ),
+        lambda stripe_account: {
+            "available": [
+                {"amount": 1100, "currency": "gbp"},
+                {"amount": 500, "currency": "usd"},
+            ]
+        },
     )
     monkeypatch.setattr(
         platform_module.StripePlatformAccountService,
@@ -213,7 +246,7 @@ def test_platform_update_payout_schedule(monkeypatch):
             }
         }
 
-    monkeypatch.setattr(platform_module.stripe.Account, "modify", staticmethod(fake_modify))
+    monkeypatch.setattr(platform_module.stripe.Account, "modify", fake_modify)
 
     schedule = StripePlatformAccountService.update_payout_schedule(
         stripe_account_id=_TEST_ACCOUNT_ID,
@@ -227,7 +260,7 @@ def test_platform_update_payout_schedule(monkeypatch):
     assert schedule == {"interval": "weekly", "weekly_anchor": "monday"}
 
 
-def test_connected_account_disable_payment_link(monkeypatch):
+def test_connected_account_disable_payment_link(monkeypatch, principal):
     captured = {}
 
     def fake_modify(link_id, **kwargs):
@@ -236,7 +269,7 @@ def test_connected_account_disable_payment_link(monkeypatch):
 
     monkeypatch.setattr(link_module.stripe.PaymentLink, "modify", fake_modify)
 
-    service = StripeConnectedAccountLinkService(_test_principal())
+    service = StripeConnectedAccountLinkService(principal)
     service.disable_payment_link("plink_1")
 
     assert captured["link_id"] == "plink_1"
@@ -244,38 +277,39 @@ def test_connected_account_disable_payment_link(monkeypatch):
     assert captured.get("stripe_account") == _TEST_ACCOUNT_ID
 
 
-def test_platform_disable_payment_link_static(monkeypatch):
-    """StripePlatformAccountService.disable_platform_payment_link (e.g. used by expire_links handler)."""
-    captured = {}
-
-    def fake_modify(link_id, **kwargs):
-        captured["link_id"] = link_id
-        captured.update(kwargs)
-
-    monkeypatch.setattr(platform_module.stripe.PaymentLink, "modify", staticmethod(fake_modify))
-
-    StripePlatformAccountService.disable_platform_payment_link("plink_99")
-
-    assert captured["link_id"] == "plink_99"
-    assert captured["active"] is False
-
-
-def test_from_account_id_disable_payment_link(monkeypatch):
-    """StripeConnectedAccountLinkService.from_account_id(...).disable_payment_link (e.g. expire_links)."""
+@pytest.mark.parametrize(
+    ("target", "disable", "expect_stripe_account"),
+    [
+        # StripePlatformAccountService.disable_platform_payment_link (e.g. used by expire_links handler)
+        (platform_module, StripePlatformAccountService.disable_platform_payment_link, False),
+        # StripeConnectedAccountLinkService.from_account_id(...).disable_payment_link (e.g. expire_links)
+        (
+            link_module,
+            lambda link_id: StripeConnectedAccountLinkService.from_account_id(_TEST_ACCOUNT_ID).disable_payment_link(
+                link_id
+            ),
+            True,
+        ),
+    ],
+    ids=["platform", "from_account_id"],
+)
+def test_disable_payment_link(monkeypatch, target, disable, expect_stripe_account):
     captured = {}
 
     def fake_modify(link_id, **kwargs):
         captured["link_id"] = link_id
         captured.update(kwargs)
 
-    monkeypatch.setattr(link_module.stripe.PaymentLink, "modify", fake_modify)
+    monkeypatch.setattr(target.stripe.PaymentLink, "modify", fake_modify)
 
-    service = StripeConnectedAccountLinkService.from_account_id(_TEST_ACCOUNT_ID)
-    service.disable_payment_link("plink_1")
+    disable("plink_1")
 
     assert captured["link_id"] == "plink_1"
     assert captured["active"] is False
-    assert captured["stripe_account"] == _TEST_ACCOUNT_ID
+    if expect_stripe_account:
+        assert captured["stripe_account"] == _TEST_ACCOUNT_ID
+    else:
+        assert "stripe_account" not in captured
 
 
 def test_from_account_id_list_transactions_for_link(monkeypatch):